@@ -9,17 +9,9 @@ st.markdown('<style>' + open('./src/style.css').read() + '</style>', unsafe_allo
 from streamlit_lottie import st_lottie
 from st_on_hover_tabs import on_hover_tabs
 
-from menu.About import main as about_page
-from menu.AI_Lens import main as ai_lens_page
-from menu.Ask_To_PDF import main as ask_to_pdf_page
-from menu.ATS import main as ats_page
-from menu.Prompt_Examples import main as prompt_examples_page
-from menu.Resume_Analyser import main as resume_analyser_page
-from menu.User import main as user_page
-from menu.Contest_Calendar import main as contest_calendar
-from menu.Projects import main as projects_page
-from menu.Job_Tracker import main as job_tracker
-from menu.AI_Interview import main as ai_interview_page
+# Pages are imported on first use so a cold start only loads Home
+from utils.page_registry import load_page
+from utils.db import init_databases
 
 
 # Initialize session state for theme
@@ -78,6 +70,9 @@ def home():
 
 # Main Function
 def main():
+    # Creates and migrates the databases on the first run only
+    init_databases()
+
     st.markdown("""
         <style>
             /* Reduce padding for the entire page */
@@ -114,22 +109,10 @@ def main():
             default_choice=0
         )
 
-    menu = {
-        'Home': home,
-        'AI Lens': ai_lens_page,
-        'Ask To PDF': ask_to_pdf_page,
-        'Resume Analyser': resume_analyser_page,
-        'ATS': ats_page, 
-        'Contest Calendar':contest_calendar,
-        'Job Tracker':job_tracker,
-        'Projects': projects_page,
-        'Prompt Examples': prompt_examples_page,
-        'AI Interview' : ai_interview_page,
-        'About': about_page,
-        'Account': user_page,
-    }
-    
-    menu[tabs]()
+    if tabs == 'Home':
+        home()
+    else:
+        load_page(tabs)()
     
     # Footer
    
@@ -0,0 +1,98 @@
+"""
+Throughput of Job Tracker bulk import and export.
+
+Generates a CSV and a JSON file of synthetic applications, imports each
+into a scratch jobs.db (through the real migrations) for one user, then
+streams the user's applications back out in both formats.
+
+    python -m benchmarks.job_bulk --rows 100000
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import tempfile
+import time
+
+from utils.db import JOBS_DB, MIGRATIONS, ConnectionPool
+from utils.job_store import STATUSES, export_jobs, import_jobs, read_rows
+
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+
+
+def make_rows(count, duplicate_ratio, rng):
+    rows = []
+    for i in range(count):
+        n = rng.randrange(i) if i and rng.random() < duplicate_ratio else i
+        rows.append({
+            "job_link": f"https://jobs.example.com/{n}",
+            "company": rng.choice(COMPANIES),
+            "status": rng.choice(STATUSES),
+        })
+    return rows
+
+
+def to_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=["job_link", "company", "status"])
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def timed(func):
+    began = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - began
+
+
+def run(count, duplicate_ratio, seed):
+    rng = random.Random(seed)
+    rows = make_rows(count, duplicate_ratio, rng)
+    files = {"csv": to_csv(rows), "json": json.dumps(rows).encode("utf-8")}
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="college-ai-bench-") as scratch:
+        pool = ConnectionPool(os.path.join(scratch, JOBS_DB), migrations=MIGRATIONS[JOBS_DB])
+        for fmt, data in files.items():
+            email = f"{fmt}@college.edu"
+            result, seconds = timed(lambda: import_jobs(email, read_rows(data, fmt), pool=pool))
+            results[f"import_{fmt}"] = {
+                "rows": count,
+                "inserted": result.inserted,
+                "duplicates": result.duplicates,
+                "invalid": len(result.errors),
+                "seconds": round(seconds, 3),
+                "rows_per_second": round(count / seconds),
+            }
+            for out in ("csv", "json"):
+                size, seconds = timed(lambda: sum(len(chunk) for chunk in export_jobs(email, out, pool=pool)))
+                results[f"export_{fmt}_as_{out}"] = {
+                    "rows": result.inserted,
+                    "bytes": size,
+                    "seconds": round(seconds, 3),
+                    "rows_per_second": round(result.inserted / seconds),
+                }
+        pool.close()
+    return {"benchmark": "job_bulk", "rows": count, "duplicate_ratio": duplicate_ratio, "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args.rows, args.duplicate_ratio, args.seed)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Login lookup latency as the users table grows.
+
+Fills a scratch users.db (through the real migrations) with synthetic
+accounts and measures the account lookup login performs, for existing and
+unknown emails, at each table size. Password hashing is left out on
+purpose, it does not depend on table size.
+
+    python -m benchmarks.login_lookup --sizes 1000 100000 1000000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from utils.db import MIGRATIONS, USERS_DB, ConnectionPool
+from utils.user_store import get_user
+
+
+def fill(pool, start, stop):
+    rows = ((f"student{i}@college.edu", f"student{i}@college.edu", "x") for i in range(start, stop))
+    with pool.transaction() as conn:
+        conn.executemany('INSERT INTO users (email, email_key, password) VALUES (?, ?, ?)', rows)
+
+
+def measure(pool, size, lookups, rng):
+    timings = {"hit": [], "miss": []}
+    for _ in range(lookups):
+        for kind, email in (
+            ("hit", f"Student{rng.randrange(size)}@College.edu"),
+            ("miss", f"nobody{rng.randrange(size)}@college.edu"),
+        ):
+            began = time.perf_counter()
+            row = get_user(email, pool)
+            timings[kind].append(time.perf_counter() - began)
+            assert (row is not None) == (kind == "hit"), email
+    return {
+        f"{kind}_{stat}_us": round(func(values) * 1e6, 1)
+        for kind, values in timings.items()
+        for stat, func in (("median", statistics.median), ("p99", lambda v: sorted(v)[int(len(v) * 0.99) - 1]))
+    }
+
+
+def run(sizes, lookups, seed):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory(prefix="college-ai-bench-") as scratch:
+        pool = ConnectionPool(os.path.join(scratch, USERS_DB), migrations=MIGRATIONS[USERS_DB])
+        results = []
+        filled = 0
+        for size in sorted(sizes):
+            began = time.perf_counter()
+            fill(pool, filled, size)
+            fill_seconds = time.perf_counter() - began
+            filled = size
+            record = {"rows": size, "fill_seconds": round(fill_seconds, 2)}
+            record.update(measure(pool, size, lookups, rng))
+            results.append(record)
+            print(json.dumps(record), file=sys.stderr)
+        pool.close()
+    return {"benchmark": "login_lookup", "lookups_per_size": lookups, "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.lookups, args.seed)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
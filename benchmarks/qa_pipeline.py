@@ -0,0 +1,173 @@
+"""
+Headless benchmark of the Ask_To_PDF document QA pipeline.
+
+Runs upload -> get_pdf_text -> get_text_chunks -> embed & index ->
+similarity_search -> chain call over synthetic PDFs, using the offline
+model stand-in, and prints per-stage wall time, peak memory and throughput
+as JSON. The index stage runs the page's own get_vector_store, so it
+includes the per-file extraction and chunking that function does, and
+saving the index to disk.
+
+    python -m benchmarks.qa_pipeline --docs 4 --pages 50 --output bench.json
+    python -m benchmarks.qa_pipeline --compare bench.json
+
+Peak memory is how far the Python heap of this process grew above its size
+at the start of the stage (tracemalloc); PDF extraction done by worker
+processes is not counted.
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from benchmarks.synthetic_pdf import make_uploads
+
+QUESTIONS = [
+    "Summarize the section about distributed systems",
+    "What does the document say about memory and cache?",
+    "Explain the role of regression in machine learning",
+    "Which programming languages are mentioned?",
+]
+
+
+@contextmanager
+def stage(results, name):
+    record = {}
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    began = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = round(time.perf_counter() - began, 4)
+        record["peak_mib"] = round((tracemalloc.get_traced_memory()[1] - before) / 2 ** 20, 2)
+        results[name] = record
+
+
+def per_second(count, seconds):
+    return round(count / seconds, 1) if seconds else None
+
+
+def run(args):
+    # Point every cache at a scratch directory and force the offline models
+    # before any page module is imported. Questions repeat, so the response
+    # cache is off to time every chain call.
+    scratch = tempfile.mkdtemp(prefix="college-ai-bench-")
+    os.environ["COLLEGE_AI_PROVIDER"] = "local"
+    os.environ["COLLEGE_AI_LOCAL_LATENCY"] = str(args.latency)
+    os.environ["COLLEGE_AI_CACHE_DIR"] = scratch
+    os.environ["COLLEGE_AI_RESPONSE_TTL"] = "0"
+
+    from menu import Ask_To_PDF as page
+
+    uploads = make_uploads(args.docs, args.pages, args.words_per_page, args.seed)
+    stages = {}
+    tracemalloc.start()
+
+    with stage(stages, "extract") as record:
+        pages = list(page.iter_pages(uploads, parallel=not args.serial))
+        record["pages"] = len(pages)
+        record["chars"] = sum(len(p.text) for p in pages)
+    stages["extract"]["pages_per_second"] = per_second(len(pages), stages["extract"]["seconds"])
+
+    with stage(stages, "chunk") as record:
+        chunks = page.get_text_chunks(pages)
+        record["chunks"] = len(chunks)
+    stages["chunk"]["chunks_per_second"] = per_second(len(chunks), stages["chunk"]["seconds"])
+
+    with stage(stages, "index") as record:
+        doc_fingerprint = page.get_vector_store(uploads, "bench")
+        vector_store = page.load_vector_store("bench", doc_fingerprint)
+        record["vectors"] = vector_store.index.ntotal
+    stages["index"]["vectors_per_second"] = per_second(vector_store.index.ntotal, stages["index"]["seconds"])
+
+    questions = (QUESTIONS * (args.queries // len(QUESTIONS) + 1))[:args.queries]
+    results = []
+    with stage(stages, "search") as record:
+        for question in questions:
+            results.append(vector_store.similarity_search(question))
+        record["queries"] = len(questions)
+    stages["search"]["queries_per_second"] = per_second(len(questions), stages["search"]["seconds"])
+
+    with stage(stages, "chain") as record:
+        ttfts = []
+        for question, docs in zip(questions, results):
+            stream = page.stream_answer(docs, question)
+            for _ in stream:
+                pass
+            ttfts.append(stream.ttft)
+        record["calls"] = len(questions)
+        record["ttft_avg"] = round(sum(ttfts) / len(ttfts), 4) if ttfts else None
+    stages["chain"]["calls_per_second"] = per_second(len(questions), stages["chain"]["seconds"])
+
+    tracemalloc.stop()
+    shutil.rmtree(scratch, ignore_errors=True)
+    return {
+        "benchmark": "qa_pipeline",
+        "params": {
+            "docs": args.docs,
+            "pages": args.pages,
+            "words_per_page": args.words_per_page,
+            "queries": args.queries,
+            "latency": args.latency,
+            "parallel": not args.serial,
+        },
+        "stages": stages,
+        "total_seconds": round(sum(s["seconds"] for s in stages.values()), 4),
+        "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def compare(current, baseline, tolerance):
+    """
+    :return: list of human readable regressions, empty when none
+    """
+    regressions = []
+    for name, record in current["stages"].items():
+        before = baseline.get("stages", {}).get(name)
+        if not before or not before.get("seconds"):
+            continue
+        change = (record["seconds"] - before["seconds"]) / before["seconds"]
+        if change > tolerance:
+            regressions.append(f"{name}: {before['seconds']}s -> {record['seconds']}s (+{change:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=2, help="number of synthetic PDFs")
+    parser.add_argument("--pages", type=int, default=20, help="pages per PDF")
+    parser.add_argument("--words-per-page", type=int, default=400)
+    parser.add_argument("--queries", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="artificial model latency in seconds")
+    parser.add_argument("--serial", action="store_true", help="extract pages on the main process")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown per stage, 0.2 = 20%%")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print("REGRESSION " + line, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Retrieval quality and prompt size: hybrid retrieval vs dense top-k.
+
+Builds a synthetic document in which every paragraph mentions a few rare
+made-up terms (like the names, codes and acronyms real course PDFs are
+full of) among common filler words, chunks and indexes it exactly like
+Ask_To_PDF, and asks one question per sampled term. A chunk is relevant to
+a question when it contains the term. For the old path (FAISS top 4) and
+the hybrid retriever it reports the share of questions with a relevant
+chunk in the prompt, mean reciprocal rank, chunks and estimated tokens per
+prompt, and retrieval latency (the question embedding is shared and not
+timed).
+
+    python -m benchmarks.retrieval --paragraphs 400 --queries 200
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic_pdf import VOCABULARY
+
+SYLLABLES = "ka lo mi nu re sa ti vo xe zy bra cre dri glo pla stu tor ven".split()
+TERMS_PER_PARAGRAPH = 3
+WORDS_PER_PARAGRAPH = 150
+
+
+def make_term(rng, used):
+    while True:
+        term = "".join(rng.choice(SYLLABLES) for _ in range(3)) + str(rng.randrange(10, 99))
+        if term not in used:
+            used.add(term)
+            return term
+
+
+def make_pages(paragraphs, rng):
+    """:return: list of Page-like objects and all the rare terms used"""
+    from utils.pdf_text import Page
+
+    used = set()
+    pages, text = [], []
+    for i in range(paragraphs):
+        words = [rng.choice(VOCABULARY) for _ in range(WORDS_PER_PARAGRAPH)]
+        for _ in range(TERMS_PER_PARAGRAPH):
+            words.insert(rng.randrange(len(words)), make_term(rng, used))
+        text.append(" ".join(words))
+        if len(text) == 4:
+            pages.append(Page("synthetic.pdf", len(pages) + 1, "\n\n".join(text), 0.0))
+            text = []
+    if text:
+        pages.append(Page("synthetic.pdf", len(pages) + 1, "\n\n".join(text), 0.0))
+    return pages, sorted(used)
+
+
+def evaluate(name, retrieve, questions, estimate_tokens):
+    hits, reciprocal_ranks, chunk_counts, tokens, seconds = 0, [], [], [], []
+    for question, vector, term in questions:
+        began = time.perf_counter()
+        docs = retrieve(question, vector)
+        seconds.append(time.perf_counter() - began)
+        rank = next((i for i, doc in enumerate(docs, start=1) if term in doc.page_content), None)
+        hits += rank is not None
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+        chunk_counts.append(len(docs))
+        tokens.append(estimate_tokens("\n\n".join(doc.page_content for doc in docs)))
+    return {
+        "path": name,
+        "hit_rate": round(hits / len(questions), 3),
+        "mrr": round(statistics.mean(reciprocal_ranks), 3),
+        "chunks_avg": round(statistics.mean(chunk_counts), 2),
+        "prompt_tokens_avg": round(statistics.mean(tokens), 1),
+        "latency_ms_avg": round(1000 * statistics.mean(seconds), 3),
+    }
+
+
+def run(args):
+    scratch = tempfile.mkdtemp(prefix="college-ai-bench-")
+    os.environ["COLLEGE_AI_PROVIDER"] = "local"
+    os.environ["COLLEGE_AI_CACHE_DIR"] = scratch
+
+    from langchain_community.vectorstores import FAISS
+    from menu import Ask_To_PDF as page
+    from utils.retrieval import HybridRetriever, estimate_tokens
+
+    rng = random.Random(args.seed)
+    pages, rare_terms = make_pages(args.paragraphs, rng)
+    chunks = page.get_text_chunks(pages)
+    embeddings = page.get_embeddings()
+    vector_store = FAISS.from_documents(chunks, embedding=embeddings)
+
+    began = time.perf_counter()
+    retriever = HybridRetriever(vector_store)
+    build_seconds = time.perf_counter() - began
+
+    questions = []
+    for term in rng.sample(rare_terms, min(args.queries, len(rare_terms))):
+        filler = " ".join(rng.sample(VOCABULARY, 3))
+        question = f"What does the document say about {term} and {filler}?"
+        questions.append((question, embeddings.embed_query(question), term))
+
+    paths = [
+        evaluate("dense_top4", lambda q, v: vector_store.similarity_search_by_vector(v, k=4), questions, estimate_tokens),
+        evaluate("hybrid", retriever.search, questions, estimate_tokens),
+    ]
+    shutil.rmtree(scratch, ignore_errors=True)
+    return {
+        "benchmark": "retrieval",
+        "params": {"paragraphs": args.paragraphs, "queries": len(questions), "seed": args.seed},
+        "chunks": len(chunks),
+        "bm25_build_ms": round(1000 * build_seconds, 1),
+        "paths": paths,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--paragraphs", type=int, default=400)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
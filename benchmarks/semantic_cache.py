@@ -0,0 +1,136 @@
+"""
+Hit rate and latency saved by the Ask_To_PDF semantic question cache.
+
+Indexes synthetic PDFs with the offline model stand-in, then replays a
+session of questions in which some are rephrasings or repeats of earlier
+ones, through the same steps as Ask_To_PDF.user_input (embed, look up,
+retrieve and answer on a miss). For each similarity threshold it reports
+the hit rate, the average latency of hits and misses after the question
+is embedded (both paths pay for that), the seconds saved and how many hits
+returned the answer to a different question.
+
+    python -m benchmarks.semantic_cache --latency 0.2 --thresholds 0.8 0.9 0.95
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic_pdf import make_uploads
+
+# Groups of questions that ask the same thing; the first of each is asked
+# first, the rest come later in the session
+QUESTION_GROUPS = [
+    ["Summarize the section about distributed systems",
+     "Summarize the distributed systems section",
+     "summarize the section about distributed systems please"],
+    ["What does the document say about memory and cache?",
+     "What does the document say about cache and memory?",
+     "What does this document say about memory and the cache"],
+    ["Explain the role of regression in machine learning",
+     "Explain regression's role in machine learning",
+     "explain the role of regression in machine learning"],
+    ["Which programming languages are mentioned?",
+     "Which programming languages does it mention?",
+     "Which languages are mentioned?"],
+    ["How is the binary search algorithm described?",
+     "Describe the binary search algorithm",
+     "How does the document describe binary search?"],
+]
+
+
+def session():
+    """(question, group) pairs: every group's first question, then the rest interleaved."""
+    first = [(group[0], g) for g, group in enumerate(QUESTION_GROUPS)]
+    rest = [(group[i], g) for i in range(1, 3) for g, group in enumerate(QUESTION_GROUPS)]
+    return first + rest
+
+
+def run(args):
+    # Scratch caches, offline models, and no exact-repeat response cache so
+    # only the semantic cache can save a call
+    scratch = tempfile.mkdtemp(prefix="college-ai-bench-")
+    os.environ["COLLEGE_AI_PROVIDER"] = "local"
+    os.environ["COLLEGE_AI_LOCAL_LATENCY"] = str(args.latency)
+    os.environ["COLLEGE_AI_CACHE_DIR"] = scratch
+    os.environ["COLLEGE_AI_RESPONSE_TTL"] = "0"
+
+    from langchain_community.vectorstores import FAISS
+    from menu import Ask_To_PDF as page
+    from utils.semantic_cache import SemanticCache
+
+    uploads = make_uploads(args.docs, args.pages, args.words_per_page, args.seed)
+    chunks = page.get_text_chunks(page.iter_pages(uploads))
+    embeddings = page.get_embeddings()
+    vector_store = FAISS.from_documents(chunks, embedding=embeddings)
+
+    results = []
+    for threshold in args.thresholds:
+        cache = SemanticCache(threshold=threshold)
+        answered_group = {}
+        hit_seconds, miss_seconds, wrong_hits = [], [], 0
+        for question, group in session():
+            vector = embeddings.embed_query(question)
+            began = time.perf_counter()
+            hit = cache.lookup("bench", vector)
+            if hit:
+                hit_seconds.append(time.perf_counter() - began)
+                wrong_hits += answered_group[hit.entry.question] != group
+                continue
+            docs = vector_store.similarity_search_by_vector(vector)
+            answer = "".join(page.stream_answer(docs, question))
+            seconds = time.perf_counter() - began
+            miss_seconds.append(seconds)
+            cache.add("bench", vector, question, answer, seconds=seconds)
+            answered_group[question] = group
+
+        stats = cache.stats()
+        results.append({
+            "threshold": threshold,
+            "questions": stats["lookups"],
+            "hits": stats["hits"],
+            "hit_rate": round(stats["hit_rate"], 3),
+            "wrong_hits": wrong_hits,
+            "hit_ms_avg": round(1000 * sum(hit_seconds) / len(hit_seconds), 3) if hit_seconds else None,
+            "miss_ms_avg": round(1000 * sum(miss_seconds) / len(miss_seconds), 3) if miss_seconds else None,
+            "seconds_saved": stats["seconds_saved"],
+        })
+
+    shutil.rmtree(scratch, ignore_errors=True)
+    return {
+        "benchmark": "semantic_cache",
+        "params": {
+            "docs": args.docs,
+            "pages": args.pages,
+            "words_per_page": args.words_per_page,
+            "latency": args.latency,
+        },
+        "thresholds": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=2, help="number of synthetic PDFs")
+    parser.add_argument("--pages", type=int, default=10, help="pages per PDF")
+    parser.add_argument("--words-per-page", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.2, help="artificial model latency in seconds")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.8, 0.85, 0.9, 0.92, 0.95])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Generate simple text-only PDFs for benchmarks, without any PDF library.
+"""
+import random
+
+VOCABULARY = (
+    "algorithm analysis array binary cache compiler complexity computer data database design distributed "
+    "engineering function graph hash index kernel language learning linear machine memory model network "
+    "operating optimization parallel probability process programming query recursion regression resume "
+    "scheduling search security semester skill software statistics student system theory thread tree "
+    "university variable vector python java project internship experience education leadership"
+).split()
+
+LINES_PER_PAGE = 45
+WORDS_PER_LINE = 12
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def page_lines(rng, words_per_page):
+    words = [rng.choice(VOCABULARY) for _ in range(words_per_page)]
+    return [" ".join(words[i:i + WORDS_PER_LINE]) for i in range(0, len(words), WORDS_PER_LINE)]
+
+
+def make_pdf(pages, words_per_page=400, seed=0):
+    """
+    Build a PDF with `pages` pages of pseudo-random words.
+    :return: the PDF as bytes
+    """
+    rng = random.Random(seed)
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    pages_obj = add(None)
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for _ in range(pages):
+        lines = page_lines(rng, words_per_page)
+        stream = "BT /F1 9 Tf 11 TL 40 800 Td " + " ".join(f"({_escape(line)}) '" for line in lines) + " ET"
+        stream = stream.encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_obj, font, content)
+        ))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[pages_obj - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(out)
+
+
+class SyntheticUpload:
+    """Mimics the UploadedFile objects Streamlit hands to the pages."""
+
+    def __init__(self, name, data):
+        self.name = name
+        self._data = data
+        self._pos = 0
+
+    def getvalue(self):
+        return self._data
+
+    def read(self, size=-1):
+        end = len(self._data) if size is None or size < 0 else self._pos + size
+        chunk = self._data[self._pos:end]
+        self._pos += len(chunk)
+        return chunk
+
+    def seek(self, pos, whence=0):
+        if whence == 1:
+            pos += self._pos
+        elif whence == 2:
+            pos += len(self._data)
+        self._pos = pos
+        return pos
+
+    def tell(self):
+        return self._pos
+
+
+def make_uploads(count, pages, words_per_page=400, seed=0):
+    return [
+        SyntheticUpload(f"synthetic-{i}.pdf", make_pdf(pages, words_per_page, seed + i))
+        for i in range(count)
+    ]
@@ -4,6 +4,7 @@ from gtts import gTTS
 import speech_recognition as sr
 from threading import Thread, Event
 from dotenv import load_dotenv
+from utils.providers import get_provider
 import os
 import time
 import json
@@ -51,7 +52,7 @@ def recognize_speech():
 # Function to Generate Chatbot Response
 def get_response(question):
     try:
-        response = openai.ChatCompletion.create(
+        return get_provider("openai").chat(
             model="gpt-3.5-turbo",
             messages=[ 
                 {"role": "system", "content": (
@@ -63,7 +64,6 @@ def get_response(question):
                 {"role": "user", "content": question},
             ]
         )
-        return response.choices[0].message["content"]
     except openai.error.OpenAIError:
         st.error("You exceeded your current quota or faced an API issue. Please check your OpenAI account and billing details.")
         raise RuntimeError("Stopping the assistant due to API error.")
@@ -111,8 +111,8 @@ def main():
         else:
             st.error("Please enter a valid API Key.")
 
-    # Check API key before proceeding
-    if "api_key" not in st.session_state:
+    # Check API key before proceeding (the offline stand-in needs none)
+    if "api_key" not in st.session_state and get_provider("openai").needs_api_key:
         st.warning("Please enter your OpenAI API key to continue.")
         st.stop()
 
@@ -1,10 +1,10 @@
 
 import streamlit as st 
-import google.generativeai as genai 
-import google.ai.generativelanguage as glm 
 from dotenv import load_dotenv
+from utils.providers import get_provider
+from utils.response_cache import get_response_cache, model_id, response_key
+from utils.streaming import TimedStream
 from PIL import Image
-import os 
 import io 
 import json
 from streamlit_lottie import st_lottie 
@@ -18,8 +18,8 @@ def image_to_byte_array(image: Image) -> bytes:
     imgByteArr=imgByteArr.getvalue()
     return imgByteArr
 
-API_KEY = os.environ.get("GOOGLE_API_KEY")
-genai.configure(api_key=API_KEY)
+CHAT_MODEL = "gemini-pro"
+VISION_MODEL = "gemini-pro-vision"
 
 def main():
   
@@ -37,16 +37,19 @@ def main():
             st_lottie(animation, 1, True, True, "high", 200, -200)
 
         prompt = st.text_input("prompt please...", placeholder="Prompt", label_visibility="visible")
-        model = genai.GenerativeModel("gemini-pro")
-
         if st.button("SEND",use_container_width=True):
-            response = model.generate_content(prompt)
-
             st.write("")
             st.header(":blue[Response]")
             st.write("")
 
-            st.markdown(response.text)
+            # Render the reply as it is generated instead of waiting for all of it;
+            # a repeated prompt is answered from the response cache
+            provider = get_provider()
+            model_name = model_id(provider, CHAT_MODEL)
+            chunks = get_response_cache().stream(
+                response_key(model_name, None, prompt), model_name, lambda: provider.stream(prompt, CHAT_MODEL), "ai_lens_chat"
+            )
+            st.write_stream(TimedStream(chunks, "ai_lens_chat"))
 
     with gemini_vision:
         st.header("Ai Lens Tab")
@@ -70,33 +73,26 @@ def main():
                 """, unsafe_allow_html=True)
             
         if st.button("GET RESPONSE", use_container_width=True):
-            model = genai.GenerativeModel("gemini-pro-vision")
-
             if uploaded_file is not None:
                 if image_prompt != "":
                     image = Image.open(uploaded_file)
-
-                    response = model.generate_content(
-                        glm.Content(
-                            parts = [
-                                glm.Part(text=image_prompt),
-                                glm.Part(
-                                    inline_data=glm.Blob(
-                                        mime_type="image/jpeg",
-                                        data=image_to_byte_array(image)
-                                    )
-                                )
-                            ]
-                        )
+                    image_bytes = image_to_byte_array(image)
+
+                    # The same question about the same image is answered from the response cache
+                    provider = get_provider(needs=("image",))
+                    model_name = model_id(provider, VISION_MODEL)
+                    response_text = get_response_cache().generate(
+                        response_key(model_name, None, image_prompt, image_bytes),
+                        model_name,
+                        lambda: provider.generate_image(image_prompt, image_bytes, "image/jpeg", VISION_MODEL),
+                        "ai_lens_vision",
                     )
 
-                    response.resolve()
-
                     st.write("")
                     st.write(":blue[Response]")
                     st.write("")
 
-                    st.markdown(response.text)
+                    st.markdown(response_text)
 
                 else:
                     st.write("")
@@ -1,14 +1,91 @@
 import streamlit as st
-import google.generativeai as genai
-import PyPDF2 as pdf
 from dotenv import load_dotenv
+from utils.ats import DEFAULT_REVIEW_TOP, EvaluationError, evaluate, iter_scores, rank
+from utils.keyword_match import description_keywords, prescore
+from utils.pdf_text import document_hash, extract_text
+from utils.providers import get_provider
 from streamlit_lottie import st_lottie 
 import json
-import os
+import pandas as pd
 
 load_dotenv()
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-model = genai.GenerativeModel('gemini-pro')
+MODEL = 'gemini-pro'
+
+# Evaluate one resume: instant local keyword match, then an optional AI profile summary
+def single_resume(desc):
+    uploaded_file = st.file_uploader("Upload Your Resume", type="pdf", help="Pls Upload PDF file Only")
+    with_summary = st.checkbox("Add an AI profile summary", value=True)
+    submit = st.button("Submit")
+
+    if submit:
+        if uploaded_file is not None:
+            # Resubmitting the same file reuses its text instead of extracting it again
+            doc_hash = document_hash(uploaded_file)
+            if st.session_state.get('ats_resume', (None, None))[0] != doc_hash:
+                st.session_state['ats_resume'] = (doc_hash, extract_text([uploaded_file]))
+            text = st.session_state['ats_resume'][1]
+            local = prescore(text, description_keywords(desc))
+
+            st.subheader("ATS Scanner Dashboard")
+            st.subheader("Candidate Evaluation Results")
+            if local.match is None:
+                st.warning("Paste a job description with some skills or keywords to get a match score")
+            else:
+                st.text(f"Percentage Match: {local.match:.0f}%")
+                st.subheader("Missing Keywords in the Resume")
+                for keyword in local.missing:
+                    st.text(keyword)
+                if local.matched:
+                    st.caption("Matched skills: " + ", ".join(local.matched))
+
+            if with_summary:
+                try:
+                    with st.spinner("Evaluating Profile..."):
+                        evaluation = evaluate(get_provider(), MODEL, text, desc)
+                except EvaluationError as e:
+                    st.warning(f"The AI evaluation came back malformed ({e}). The keyword match above is unaffected; submit again to retry.")
+                    return
+
+                st.subheader("Profile Summary")
+                st.text(f"AI Percentage Match: {evaluation.match:.0f}%")
+                st.markdown(evaluation.profile_summary)
+
+# Rank many resumes against one description; the table re-ranks as each score arrives
+def batch_resumes(desc):
+    uploaded_files = st.file_uploader("Upload Resumes", type="pdf", accept_multiple_files=True, help="Pls Upload PDF files Only")
+    review_top = st.number_input("AI review of the top N resumes", min_value=0, max_value=50, value=DEFAULT_REVIEW_TOP, step=1)
+    submit = st.button("Rank Resumes")
+
+    if submit and uploaded_files:
+        count = len(uploaded_files)
+        reviews = min(review_top, count)
+        progress = st.progress(0.0, text="Reading resumes...")
+        table = st.empty()
+        scores = {}
+        for done, score in enumerate(iter_scores(uploaded_files, desc, MODEL, get_provider(), review_top), start=1):
+            scores[score.index] = score
+            if done <= count:
+                text = f"Scored {done} of {count} resumes"
+            else:
+                text = f"AI reviewed {done - count} of {reviews} top resumes"
+            progress.progress(min(done / (count + reviews), 1.0), text=text)
+            table.dataframe(ranking_table(scores.values()), width=1500, hide_index=True)
+        failed = sum(1 for score in scores.values() if score.error)
+        progress.progress(1.0, text=f"Ranked {len(scores) - failed} resumes" + (f", {failed} could not be scored" if failed else ""))
+        st.session_state['ats_ranking'] = list(scores.values())
+    elif st.session_state.get('ats_ranking'):
+        st.dataframe(ranking_table(st.session_state['ats_ranking']), width=1500, hide_index=True)
+
+def ranking_table(scores):
+    ranked = rank(scores)
+    return pd.DataFrame({
+        "Rank": range(1, len(ranked) + 1),
+        "Resume": [s.source for s in ranked],
+        "Match %": [s.match for s in ranked],
+        "Missing Keywords": [", ".join(s.missing) for s in ranked],
+        "AI Match %": [s.ai_match for s in ranked],
+        "Profile Summary": [s.error or s.summary for s in ranked],
+    })
 
 def main():
     st.write("<h1><center>Applicant tracking systems</center></h1>", unsafe_allow_html=True)
@@ -23,40 +100,11 @@ def main():
     if st.session_state['is_logged']:
         st.text_input("Job Role")
         desc = st.text_area("Paste the Job Description")
-        uploaded_file = st.file_uploader("Upload Your Resume", type="pdf", help="Pls Upload PDF file Only")
-        submit = st.button("Submit")
-
-        if submit:
-            if uploaded_file is not None:
-                reader = pdf.PdfReader(uploaded_file)
-                text = ""
-                for page_number in range(len(reader.pages)):
-                    page = reader.pages[page_number] 
-                    text += str(page.extract_text())
-
-                input_prompt = f'''
-                You're a skilled ATS (Applicant Tracking System) Scanner with a deep understanding of tech roles, software development, 
-                tech consulting, and understand the ATS role in-depth. Your task is to evaluate the resume against the given description. 
-                You must consider that the job market is crowded with applications and you should only pick the best talent. 
-                Thus, assign the percentage & MissingKeywords with honesty & accuracy
-                resume: {text}
-                description: {desc}
-                I want a output in one single string having the structure: {{"PercentageMatch": "%", "MissingKeywordsintheResume": [], "ProfileSummary": ""}}.
-                '''
-
-                with st.spinner("Evaluating Profile..."):
-                    response = model.generate_content(input_prompt)
-                response_data = json.loads(response.text)
-                # st.write(response.text)
-
-                st.subheader("ATS Scanner Dashboard")
-                st.subheader("Candidate Evaluation Results")
-                st.text(f"Percentage Match: {response_data['PercentageMatch']}")
-                st.subheader("Missing Keywords in the Resume")
-                for keyword in response_data['MissingKeywordsintheResume']:
-                    st.text(keyword)
-                st.subheader("Profile Summary")
-                st.markdown(response_data['ProfileSummary'])
+        mode = st.radio("Mode", ["Single resume", "Rank many resumes"], horizontal=True)
+        if mode == "Single resume":
+            single_resume(desc)
+        else:
+            batch_resumes(desc)
         if st.button("Logout"):
             st.session_state['is_logged'] = False
             del st.session_state['user']
@@ -1,55 +1,118 @@
 import streamlit as st
-from PyPDF2 import PdfReader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-import os
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-import google.generativeai as genai
 from langchain_community.vectorstores import FAISS
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.chains.question_answering import load_qa_chain
 from langchain.prompts import PromptTemplate
 from dotenv import load_dotenv
+from utils.embedding_cache import CachedEmbeddings
+from utils.providers import get_provider
+from utils.pdf_text import document_hash, iter_pages
+from utils.index_store import fingerprint, get_store, index_owner
+from utils.resource_cache import get_resources
+from utils.retrieval import HybridRetriever
+from utils.response_cache import get_response_cache, model_id, response_key
+from utils.semantic_cache import get_semantic_cache
+from utils.streaming import TimedStream
 from streamlit_lottie import st_lottie 
 import json
-import faiss
-import pickle
 import asyncio
+import time
 
 load_dotenv()
 
-os.getenv("GOOGLE_API_KEY")
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-
+# Pages are extracted in parallel and streamed to the chunker one by one
 def get_pdf_text(pdf_docs):
-    text = ""
-    for pdf in pdf_docs:
-        pdf_reader = PdfReader(pdf)
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-    return text
-
-def get_text_chunks(text):
+    return iter_pages(pdf_docs)
+
+def get_text_chunks(pages):
     text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-    chunks = text_splitter.split_text(text)
+    chunks = []
+    for page in pages:
+        # Keep the file name and page number with every chunk for citations
+        chunks.extend(text_splitter.create_documents([page.text], [{"source": page.source, "page": page.number}]))
     return chunks
 
-def get_vector_store(text_chunks):
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-    vector_store = FAISS.from_texts(text_chunks, embedding=embeddings)
-    faiss.write_index(vector_store.index, "faiss_index.bin")
-    with open("faiss_store.pkl", "wb") as f:
-        pickle.dump({"docstore": vector_store.docstore, "index_to_docstore_id": vector_store.index_to_docstore_id}, f)
-
-def load_vector_store():
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-    index = faiss.read_index("faiss_index.bin")
-    with open("faiss_store.pkl", "rb") as f:
-        store_data = pickle.load(f)
-    vector_store = FAISS(embedding_function=embeddings.embed_query, index=index, docstore=store_data["docstore"], index_to_docstore_id=store_data["index_to_docstore_id"])
-    return vector_store
-
-async def get_conversational_chain():
-    prompt_template = """
+EMBEDDING_MODEL = "models/embedding-001"
+CHAT_MODEL = "gemini-pro"
+TEMPERATURE = 0.3
+PROVIDER_NEEDS = ("embeddings", "chat_model")
+
+def embedding_key():
+    # Vectors from different providers must never be mixed in a cache or index
+    return f"{get_provider(needs=PROVIDER_NEEDS).name}:{EMBEDDING_MODEL}"
+
+# Chunks already embedded by any page are served from the local cache
+def get_embeddings():
+    key = embedding_key()
+    return get_resources().get(
+        ("embeddings", key),
+        lambda: CachedEmbeddings(get_provider(needs=PROVIDER_NEEDS).embeddings(EMBEDDING_MODEL), key),
+    )
+
+# Every user and document set gets its own index so sessions never clobber each other.
+# A new set is derived from the previous one: only added files are embedded and
+# only removed files are deleted, unchanged files are skipped by hash.
+def get_vector_store(pdf_docs, owner, base_fingerprint=None):
+    docs_by_hash = {document_hash(pdf): pdf for pdf in pdf_docs}
+    doc_fingerprint = fingerprint(docs_by_hash, embedding_key())
+    store = get_store()
+    if store.exists(owner, doc_fingerprint):
+        return doc_fingerprint
+
+    embeddings = get_embeddings()
+    vector_store = None
+    manifest = {}
+    if base_fingerprint and base_fingerprint != doc_fingerprint and store.exists(owner, base_fingerprint):
+        manifest = store.load_manifest(owner, base_fingerprint)
+        # An index saved before manifests existed cannot say which vectors
+        # belong to which file, so it is rebuilt from scratch instead
+        if manifest:
+            # Load a private copy, the cached one may be in use by another question
+            vector_store = store.load(owner, base_fingerprint, embeddings)
+
+    removed_ids = []
+    for doc_hash in [h for h in manifest if h not in docs_by_hash]:
+        removed_ids.extend(manifest.pop(doc_hash)["ids"])
+    if removed_ids:
+        vector_store.delete(removed_ids)
+
+    for doc_hash, pdf in docs_by_hash.items():
+        if doc_hash in manifest:
+            continue
+        text_chunks = get_text_chunks(get_pdf_text([pdf]))
+        ids = [f"{doc_hash[:16]}-{i}" for i in range(len(text_chunks))]
+        if text_chunks:
+            if vector_store is None:
+                vector_store = FAISS.from_documents(text_chunks, embedding=embeddings, ids=ids)
+            else:
+                vector_store.add_documents(text_chunks, ids=ids)
+        manifest[doc_hash] = {"source": getattr(pdf, "name", ""), "ids": ids}
+
+    if vector_store is None:
+        return None
+    store.save(vector_store, owner, doc_fingerprint, manifest)
+    return doc_fingerprint
+
+# Loaded indexes stay in memory until the index on disk is rebuilt
+def load_vector_store(owner, doc_fingerprint):
+    store = get_store()
+    version = store.version(owner, doc_fingerprint)
+    store.touch(owner, doc_fingerprint)
+    return get_resources().get(
+        ("faiss", owner, doc_fingerprint),
+        lambda: store.load(owner, doc_fingerprint, get_embeddings()),
+        version,
+    )
+
+# The BM25 side of hybrid retrieval is built once per loaded index
+def load_retriever(owner, doc_fingerprint):
+    vector_store = load_vector_store(owner, doc_fingerprint)
+    return get_resources().get(
+        ("retriever", owner, doc_fingerprint),
+        lambda: HybridRetriever(vector_store),
+        id(vector_store),
+    )
+
+PROMPT_TEMPLATE = """
     Leave First 1 line empty and then give reply
     1. Answer the question as detailed as possible from the provided context 
     2. (if not in context search on Internet), 
@@ -67,26 +130,68 @@ async def get_conversational_chain():
     Answer:
     """
 
-    model = ChatGoogleGenerativeAI(model="gemini-pro", temperature=0.3)
-
-    prompt = PromptTemplate(template=prompt_template, input_variables=["context", "question"])
-    chain = load_qa_chain(model, chain_type="stuff", prompt=prompt)
-
-    return chain
-
-def user_input(user_question):
-    vector_store = load_vector_store()
-    docs = vector_store.similarity_search(user_question)
-
-    chain = asyncio.run(get_conversational_chain())
-
-    response = chain(
-        {"input_documents": docs, "question": user_question},
-        return_only_outputs=True
+async def get_chat_model():
+    # Created inside an event loop because the Gemini client needs one
+    return get_provider(needs=PROVIDER_NEEDS).chat_model(CHAT_MODEL, TEMPERATURE)
+
+# Stuffs the retrieved chunks into the prompt and streams the reply as it is generated.
+# The same question over the same chunks is answered from the response cache.
+def stream_answer(docs, user_question):
+    model = get_resources().get(("chat_model", "ask_to_pdf", get_provider().name), lambda: asyncio.run(get_chat_model()))
+    prompt = PromptTemplate(template=PROMPT_TEMPLATE, input_variables=["context", "question"])
+    context = "\n\n".join(doc.page_content for doc in docs)
+    model_name = model_id(get_provider(), CHAT_MODEL)
+    # The template is part of the context so editing it retires old answers
+    key = response_key(model_name, TEMPERATURE, user_question, PROMPT_TEMPLATE + context)
+    chunks = get_response_cache().stream(
+        key, model_name, lambda: model.stream(prompt.format(context=context, question=user_question)), "ask_to_pdf"
+    )
+    return TimedStream(chunks, "ask_to_pdf")
+
+def show_sources(sources):
+    if sources:
+        st.caption("Sources: " + ", ".join(f"{source} p.{page}" for source, page in sources))
+
+# A question similar enough to one already answered about the same PDFs reuses
+# that answer; its embedding is reused for retrieval on a miss
+def user_input(user_question, use_cache=True):
+    doc_fingerprint = st.session_state.get('pdf_fingerprint')
+    if not doc_fingerprint:
+        st.warning("Please upload your PDF Files and click on Train & Process first")
+        return
+    owner = index_owner(st.session_state)
+    try:
+        retriever = load_retriever(owner, doc_fingerprint)
+    except FileNotFoundError:
+        st.warning("Your PDF index has expired, please click on Train & Process again")
+        return
+
+    question_vector = get_embeddings().embed_query(user_question)
+    # Both paths embed the question, so only what a hit skips is timed
+    began = time.perf_counter()
+    semantic_cache = get_semantic_cache()
+    document_key = (owner, doc_fingerprint)
+    hit = semantic_cache.lookup(document_key, question_vector) if use_cache else None
+
+    st.write("Reply: ")
+    if hit:
+        st.session_state.output_text = hit.entry.answer
+        st.markdown(hit.entry.answer)
+        show_sources(hit.entry.sources)
+        st.caption(f'Reused the answer to "{hit.entry.question}" ({hit.similarity:.0%} similar). '
+                   'Tick "Skip saved answers" to ask again.')
+        return
+
+    # BM25 + dense candidates, reranked and trimmed to the prompt token budget
+    docs = retriever.search(user_question, question_vector)
+    st.session_state.output_text = st.write_stream(stream_answer(docs, user_question))
+
+    sources = sorted({(doc.metadata.get("source", ""), doc.metadata.get("page", 0)) for doc in docs if doc.metadata})
+    show_sources(sources)
+    semantic_cache.add(
+        document_key, question_vector, user_question, st.session_state.output_text, sources,
+        time.perf_counter() - began,
     )
-
-    st.session_state.output_text = response["output_text"]
-    st.write("Reply: ", st.session_state.output_text)
 
 def main():
     # st.set_page_config("College.ai", page_icon='🔍', layout='centered')
@@ -114,14 +219,18 @@ def main():
     if st.button("Train & Process"):
         if pdf_docs:
             with st.spinner("🤖Processing..."):
-                raw_text = get_pdf_text(pdf_docs)
-                text_chunks = get_text_chunks(raw_text)
-                get_vector_store(text_chunks)
-                st.success("Done, AI is trained")
+                owner = index_owner(st.session_state)
+                doc_fingerprint = get_vector_store(pdf_docs, owner, st.session_state.get('pdf_fingerprint'))
+                if doc_fingerprint:
+                    st.session_state.pdf_fingerprint = doc_fingerprint
+                    st.success("Done, AI is trained")
+                else:
+                    st.warning("No text found in the uploaded PDFs.")
 
     
 
     user_question = st.text_input("Ask a Question from the PDF Files")
+    skip_saved = st.checkbox("Skip saved answers", help="Always ask the model, even if a similar question was answered before")
     enter_button = st.button('Enter')
 
     if enter_button or st.session_state.prompt_selected:
@@ -133,7 +242,7 @@ def main():
             st.session_state.output_text = ""  # Reset output text when input changes
 
         if user_question:
-            user_input(user_question)
+            user_input(user_question, use_cache=not skip_saved)
 
     if pdf_docs:
         st.session_state.pdf_docs = pdf_docs
@@ -2,62 +2,11 @@
 import streamlit as st
 import json
 from streamlit_lottie import st_lottie
-import sqlite3
+from utils.job_analytics import get_analytics
+from utils.job_store import SORT_COLUMNS, STATUSES, add_job, count_jobs, export_jobs, import_jobs, list_jobs, read_rows, update_status
 import pandas as pd
 
-# Function to create a SQLite database and a table
-def create_db():
-    conn = sqlite3.connect('jobs.db')
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS jobs (
-            application_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT,
-            job_link TEXT,
-            company TEXT,
-            status TEXT
-        )
-    ''')
-    conn.commit()
-    conn.close()
-
-def check_job(email,job_link):
-    conn = sqlite3.connect('jobs.db')
-    c = conn.cursor()
-    c.execute('SELECT job_link FROM jobs WHERE email = ?', (email,))
-    job_links = c.fetchall()
-    conn.commit()
-    conn.close()
-    job_list = list(map(lambda x: x[0], job_links))
-    if job_link in job_list:
-        return False
-    return True
-# Function to add a new job to the database
-def add_job(email, job_link, company, status):
-    conn = sqlite3.connect('jobs.db')
-    c = conn.cursor()
-    c.execute('''
-        INSERT INTO jobs (email, job_link, company, status) VALUES (?, ?, ?, ?)
-    ''', (email, job_link, company, status))
-    conn.commit()
-    conn.close()
-
-# Function to update the status of a job in the database
-def update_status(email, application_id, status):
-    conn = sqlite3.connect('jobs.db')
-    c = conn.cursor()
-    c.execute('''UPDATE jobs SET status = ? WHERE email = ? AND application_id = ?''', (status, email, application_id))
-    conn.commit()
-    conn.close()
-
-# Function to retrieve all jobs from the database
-def get_jobs(email):
-    conn = sqlite3.connect('jobs.db')
-    c = conn.cursor()
-    c.execute('SELECT application_id, job_link, company, status FROM jobs WHERE email = ?', (email,))
-    jobs = c.fetchall()
-    conn.close()
-    return jobs
+PAGE_SIZE = 25
 
 # Function to display the form to add a new job
 def add_job_form():
@@ -65,11 +14,11 @@ def add_job_form():
     with st.form(key='add_job'):
         job_link = st.text_input("Job Link")
         company = st.text_input("Company")
-        status = st.selectbox("Status", ["applied", "testlink_received", "interviewed", "offered", "rejected", "accepted"])
+        status = st.selectbox("Status", STATUSES)
         submit_button = st.form_submit_button(label='Save')
         if submit_button:
-            if check_job(st.session_state['user'],job_link):
-                add_job(st.session_state['user'], job_link, company, status)
+            # The unique (email, job_link) index rejects duplicates
+            if add_job(st.session_state['user'], job_link, company, status):
                 st.success("Job added successfully!")
                 st.rerun()
             else:
@@ -80,12 +29,95 @@ def update_status_form():
     st.markdown("<h3 style='text-align: center;'>Update Job Status</h3>", unsafe_allow_html=True)
     with st.form(key='update_status'):
         application_id = st.number_input("Application ID", min_value=1, step=1)
-        status = st.selectbox("New Status", ["applied", "testlink_received", "interviewed", "offered", "rejected", "accepted"])
+        status = st.selectbox("New Status", STATUSES)
         submit_button = st.form_submit_button(label='Update')
         if submit_button:
-            update_status(st.session_state['user'], application_id, status)
-            st.success("Job status updated successfully!")
-            st.rerun()
+            if update_status(st.session_state['user'], application_id, status):
+                st.success("Job status updated successfully!")
+                st.rerun()
+            else:
+                st.warning("No application with that ID")
+
+# Function to display one page of the user's jobs, filtered and sorted in SQL
+def job_listing():
+    st.markdown("<h3 style='text-align: center;'>Job Listings</h3>", unsafe_allow_html=True)
+    email = st.session_state['user']
+    col1, col2, col3 = st.columns(3)
+    status = col1.selectbox("Filter by Status", ["all"] + STATUSES)
+    sort = col2.selectbox("Sort by", list(SORT_COLUMNS))
+    status = None if status == "all" else status
+
+    total = count_jobs(email, status)
+    pages = max(1, (total + PAGE_SIZE - 1) // PAGE_SIZE)
+    page = col3.number_input("Page", min_value=1, max_value=pages, value=1, step=1)
+
+    jobs = list_jobs(email, status, sort, PAGE_SIZE, (page - 1) * PAGE_SIZE)
+    df = pd.DataFrame(jobs, columns=["Unique Application ID", "Job Link", "Company", "Status"])
+    st.dataframe(df, width=1500,hide_index=True)
+    if total:
+        first = (page - 1) * PAGE_SIZE + 1
+        st.caption(f"Showing {first}-{first + len(jobs) - 1} of {total} applications")
+
+# Function to display status analytics; every figure is an aggregate query, cached until the next write
+def analytics_dashboard():
+    st.markdown("<h3 style='text-align: center;'>Application Analytics</h3>", unsafe_allow_html=True)
+    analytics = get_analytics(st.session_state['user'])
+    if not analytics.funnel:
+        st.info("Add some applications to see analytics")
+        return
+
+    counts = dict(analytics.funnel)
+    cols = st.columns(len(STATUSES))
+    for col, status in zip(cols, STATUSES):
+        col.metric(status.replace("_", " ").title(), counts.get(status, 0))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.caption("Stage conversion")
+        conversions = pd.DataFrame(analytics.conversions, columns=["Stage", "Reached", "From Previous"])
+        conversions["From Previous"] = conversions["From Previous"].map(lambda r: "" if pd.isna(r) else f"{r:.0%}")
+        st.dataframe(conversions, hide_index=True)
+    with col2:
+        st.caption("Average days in status")
+        durations = pd.DataFrame(analytics.time_in_status, columns=["Status", "Stays", "Average Days", "Max Days"])
+        st.dataframe(durations.round(1), hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.caption("Applications per week")
+        st.bar_chart(pd.DataFrame(analytics.weekly, columns=["Week", "Applications"]).set_index("Week"))
+    with col2:
+        st.caption("Top companies")
+        companies = pd.DataFrame(analytics.companies, columns=["Company", "Applications", "Interviews", "Offers"])
+        st.dataframe(companies, hide_index=True)
+
+# Function to import many jobs from a spreadsheet and export them again
+def bulk_jobs_form():
+    st.markdown("<h3 style='text-align: center;'>Import / Export</h3>", unsafe_allow_html=True)
+    email = st.session_state['user']
+    with st.expander("Import applications from CSV or JSON"):
+        st.caption("Columns: job_link (required), company, status (one of " + ", ".join(STATUSES) + ")")
+        uploaded = st.file_uploader("Applications file", type=["csv", "json", "jsonl"], key="jobs_import")
+        if uploaded is not None and st.button("Import"):
+            fmt = uploaded.name.rsplit(".", 1)[-1].lower()
+            try:
+                result = import_jobs(email, read_rows(uploaded.getvalue(), fmt))
+            except (ValueError, UnicodeDecodeError) as e:
+                st.error(f"Could not read the file: {e}")
+            else:
+                st.success(f"Imported {result.inserted} applications, skipped {result.duplicates} already tracked")
+                if result.errors:
+                    st.warning(f"{len(result.errors)} rows were invalid and not imported")
+                    st.dataframe(pd.DataFrame(result.errors[:200], columns=["Line", "Error"]), hide_index=True)
+
+    fmt = st.radio("Export format", ["csv", "json"], horizontal=True)
+    # Built only when the button is clicked, not on every render
+    st.download_button(
+        "Export applications",
+        data=lambda: "".join(export_jobs(email, fmt)),
+        file_name=f"applications.{fmt}",
+        mime="text/csv" if fmt == "csv" else "application/json",
+    )
 
 # Main app function
 def main():
@@ -99,16 +131,13 @@ def main():
         st.session_state['is_logged'] = False
 
     if st.session_state['is_logged']:
-        create_db()
-
         # Display existing jobs in a table
-        st.markdown("<h3 style='text-align: center;'>Job Listings</h3>", unsafe_allow_html=True)
-        jobs = get_jobs(st.session_state['user'])
-        df = pd.DataFrame(jobs, columns=["Unique Application ID", "Job Link", "Company", "Status"])
-        st.dataframe(df, width=1500,hide_index=True)
+        job_listing()
+        analytics_dashboard()
 
         add_job_form()
         update_status_form()
+        bulk_jobs_form()
 
         if st.button("Logout"):
             st.session_state['is_logged'] = False
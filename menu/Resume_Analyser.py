@@ -1,50 +1,68 @@
 import streamlit as st
-from PyPDF2 import PdfReader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-import os
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-import google.generativeai as genai
 from langchain_community.vectorstores import FAISS
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.chains.question_answering import load_qa_chain
 from langchain.prompts import PromptTemplate
 from dotenv import load_dotenv
+from utils.embedding_cache import CachedEmbeddings
+from utils.providers import get_provider
+from utils.pdf_text import document_hash, extract_text
+from utils.index_store import fingerprint, get_store, index_owner
+from utils.resource_cache import get_resources
+from utils.response_cache import get_response_cache, model_id, response_key
+from utils.request_pool import RequestPool
+from utils.resume_sections import SECTIONS, split_sections
+from utils.retrieval import estimate_tokens
+from utils.streaming import TimedStream
 from streamlit_lottie import st_lottie
 import json
-import asyncio
+import queue
 
 # Load environment variables
 load_dotenv()
 
-# Configure the API key for Google Generative AI
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-
 def get_pdf_text(pdf_docs):
-    text = ""
-    for pdf in pdf_docs:
-        pdf_reader = PdfReader(pdf)
-        for page in pdf_reader.pages:
-            if page.extract_text():
-                text += page.extract_text()
-    return text
+    return extract_text(pdf_docs)
 
 def get_text_chunks(text):
     text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
     chunks = text_splitter.split_text(text)
     return chunks
 
-def get_vector_store(text_chunks):
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
+EMBEDDING_MODEL = "models/embedding-001"
+CHAT_MODEL = "gemini-pro"
+TEMPERATURE = 0.3
+PROVIDER_NEEDS = ("embeddings",)
+
+def embedding_key():
+    # Vectors from different providers must never be mixed in a cache or index
+    return f"{get_provider(needs=PROVIDER_NEEDS).name}:{EMBEDDING_MODEL}"
+
+# Chunks already embedded by any page are served from the local cache
+def get_embeddings():
+    key = embedding_key()
+    return get_resources().get(
+        ("embeddings", key),
+        lambda: CachedEmbeddings(get_provider(needs=PROVIDER_NEEDS).embeddings(EMBEDDING_MODEL), key),
+    )
+
+# Every user and document set gets its own index so sessions never clobber each other
+def get_vector_store(text_chunks, owner, doc_fingerprint):
+    embeddings = get_embeddings()
     vector_store = FAISS.from_texts(text_chunks, embedding=embeddings)
-    vector_store.save_local("faiss_index")
+    get_store().save(vector_store, owner, doc_fingerprint)
 
-def load_vector_store():
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-    vector_store = FAISS.load_local("faiss_index", embeddings, allow_dangerous_deserialization=True)
-    return vector_store
+# Loaded indexes stay in memory until the index on disk is rebuilt
+def load_vector_store(owner, doc_fingerprint):
+    store = get_store()
+    version = store.version(owner, doc_fingerprint)
+    store.touch(owner, doc_fingerprint)
+    return get_resources().get(
+        ("faiss", owner, doc_fingerprint),
+        lambda: store.load(owner, doc_fingerprint, get_embeddings()),
+        version,
+    )
 
-async def get_conversational_chain():
-    prompt_template = """
+PROMPT_TEMPLATE = """
     You are an Advanced resume Analyzer.
     1. Analyze the resume and give the best 3 job domains relevant to the skills in the given context.
     2. Based on those job domains, separately suggest more skills and best courses from YouTube.
@@ -57,31 +75,145 @@ async def get_conversational_chain():
     Answer:
     """
 
-    model = ChatGoogleGenerativeAI(model="gemini-pro", temperature=0.3)
-    prompt = PromptTemplate(template=prompt_template, input_variables=["context"])
-    chain = load_qa_chain(model, chain_type="stuff", prompt=prompt)
+# Per-section prompts; a resume without a skills section is also analysed whole with PROMPT_TEMPLATE
+SECTION_PROMPTS = {
+    "skills": """
+    You are an Advanced resume Analyzer. Below is the skills section of a resume.
+    1. Give the best 3 job domains relevant to these skills.
+    2. For each job domain, separately suggest more skills and best courses from YouTube.
+    3. Use bullet points and tables, and ensure the provided YouTube links are working and are the latest.
 
-    return chain
+    Skills:\n {context}\n
 
-def user_input(user_question):
-    try:
-        vector_store = load_vector_store()
-        docs = vector_store.similarity_search(user_question)
+    Answer:
+    """,
+    "experience": """
+    You are an Advanced resume Analyzer. Below is the work experience section of a resume.
+    1. Suggest improvements: stronger action verbs, measurable impact, relevant keywords.
+    2. Point out anything missing or unclear (dates, roles, technologies used).
+    3. Use bullet points and keep the text interactive.
+
+    Experience:\n {context}\n
+
+    Answer:
+    """,
+    "education": """
+    You are an Advanced resume Analyzer. Below is the education section of a resume.
+    1. Suggest how to present it better (grades, relevant coursework, certifications worth adding).
+    2. Use bullet points and keep the text short.
 
-        # Create an event loop and run the asynchronous function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        chain = loop.run_until_complete(get_conversational_chain())
+    Education:\n {context}\n
+
+    Answer:
+    """,
+    "projects": """
+    You are an Advanced resume Analyzer. Below is the projects section of a resume.
+    1. Suggest improvements to each project description (problem, tech stack, outcome).
+    2. Suggest 2 new projects that would strengthen the resume, with the skills they show.
+    3. Use bullet points and tables.
+
+    Projects:\n {context}\n
+
+    Answer:
+    """,
+    "resume": PROMPT_TEMPLATE,
+}
+SECTION_TITLES = {
+    "skills": "Skills & Job Domains",
+    "experience": "Experience",
+    "education": "Education",
+    "projects": "Projects",
+    "resume": "Resume Analysis",
+}
+# Searches used when the resume is too long to send section by section
+SECTION_QUERIES = {
+    "skills": "technical skills programming languages tools technologies frameworks",
+    "experience": "work experience internship role company responsibilities achievements",
+    "education": "education degree university college school grade cgpa coursework",
+    "projects": "projects built developed implemented github application",
+}
+# Largest resume text (in estimated tokens) analysed without an index
+CONTEXT_TOKENS = 8000
+
+# Sections are parsed locally; only a resume longer than the model context is
+# indexed, and then each section's chunks are retrieved from the index
+def resume_contexts(raw_text, pdf_docs):
+    if estimate_tokens(raw_text) <= CONTEXT_TOKENS:
+        sections = split_sections(raw_text)
+        contexts = {name: sections[name] for name in SECTIONS if sections.get(name)}
+        if "skills" not in contexts:
+            # The job domains come from the skills prompt; get them from the whole resume instead
+            contexts = {"resume": raw_text, **contexts}
+        return contexts
+
+    owner = index_owner(st.session_state)
+    doc_fingerprint = fingerprint([document_hash(pdf) for pdf in pdf_docs], embedding_key())
+    if not get_store().exists(owner, doc_fingerprint):
+        get_vector_store(get_text_chunks(raw_text), owner, doc_fingerprint)
+    vector_store = load_vector_store(owner, doc_fingerprint)
+    return {
+        name: "\n\n".join(doc.page_content for doc in vector_store.similarity_search(query))
+        for name, query in SECTION_QUERIES.items()
+    }
+
+# One streamed model call per section, run on a pool thread; the text so far is
+# posted to `updates` for the script thread to render. The same section text is
+# answered from the response cache.
+def stream_section(provider, section, context, updates):
+    template = SECTION_PROMPTS[section]
+    prompt = PromptTemplate(template=template, input_variables=["context"]).format(context=context)
+    model_name = model_id(provider, CHAT_MODEL)
+    chunks = get_response_cache().stream(
+        response_key(model_name, TEMPERATURE, template, context),
+        model_name,
+        lambda: provider.stream(prompt, CHAT_MODEL, TEMPERATURE),
+        "resume_analyser",
+    )
+    text = ""
+    for chunk in TimedStream(chunks, "resume_analyser"):
+        text += chunk
+        updates.put((section, text))
+    return text
 
-        response = chain(
-            {"input_documents": docs},
-            return_only_outputs=True
-        )
+# Sections are analysed concurrently, each streamed into its own placeholder.
+# Streamlit elements can only be updated from the script thread, so the pool
+# threads hand their progress over through a queue.
+def show_analysis(contexts):
+    provider = get_provider()
+    placeholders = {}
+    for section in contexts:
+        st.subheader(SECTION_TITLES[section])
+        placeholders[section] = st.empty()
+        placeholders[section].caption("Analysing...")
 
-        st.session_state.output_text = response["output_text"]
-        st.write("Reply: ", st.session_state.output_text)
-    except Exception as e:
-        st.error(f"An error occurred: {e}")
+    results = {}
+    updates = queue.Queue()
+    with RequestPool(workers=len(contexts), is_transient=provider.is_transient) as pool:
+        futures = {
+            pool.submit(stream_section, provider, section, context, updates): section
+            for section, context in contexts.items()
+        }
+        finished = set()
+        while len(finished) < len(futures):
+            try:
+                section, text = updates.get(timeout=0.05)
+                # Updates queued before a section finished must not overwrite its final text
+                if section not in finished:
+                    placeholders[section].markdown(text)
+            except queue.Empty:
+                pass
+            for future, section in futures.items():
+                if section in finished or not future.done():
+                    continue
+                finished.add(section)
+                try:
+                    results[section] = future.result()
+                    placeholders[section].markdown(results[section])
+                except Exception as e:
+                    placeholders[section].error(f"Could not analyse this section: {e}")
+    st.session_state.output_text = "\n\n".join(
+        f"## {SECTION_TITLES[section]}\n\n{results[section]}" for section in contexts if section in results
+    )
 
 def main():
     # Load animation from JSON 
@@ -112,9 +244,7 @@ def main():
                     try:
                         raw_text = get_pdf_text(pdf_docs)
                         if raw_text:
-                            text_chunks = get_text_chunks(raw_text)
-                            get_vector_store(text_chunks)
-                            user_input(raw_text)
+                            show_analysis(resume_contexts(raw_text, pdf_docs))
                         else:
                             st.warning("No text found in the uploaded PDFs.")
                     except Exception as e:
@@ -1,42 +1,30 @@
 import streamlit as st
-import sqlite3
 from streamlit_authenticator.utilities.hasher import Hasher
-import bcrypt
 import re
-
-salt = bcrypt.gensalt(rounds=12)
-
-user_conn = sqlite3.connect('users.db',check_same_thread=False)
-user_cursor = user_conn.cursor()
-user_cursor.execute('''
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER AUTO_INCREMENT PRIMARY KEY,
-        email TEXT UNIQUE,
-        password TEXT
-    )
-''')
-user_conn.commit()
+from utils.passwords import HashingBusy, allow_attempt, hash_password, record_failure, reset_attempts, verify_password
+from utils.user_store import create_user, email_exists, get_user, normalize_email, update_password
 
 
 if 'is_logged' not in st.session_state: 
     st.session_state['is_logged'] = False
 
+def client_ip():
+    """Best effort client address, used to throttle login attempts per IP."""
+    context = getattr(st, "context", None)
+    if context is None:
+        return None
+    ip = getattr(context, "ip_address", None)
+    if ip:
+        return ip
+    headers = getattr(context, "headers", None) or {}
+    forwarded = headers.get("X-Forwarded-For", "")
+    return forwarded.split(",")[0].strip() or headers.get("X-Real-Ip") or None
+
 def main():
     st.write("<h1><center>Account</center></h1>", unsafe_allow_html=True)
     
     tab1, tab2 = st.tabs(["Login", "SignUp"])
 
-    def get_user_emails():
-        user_cursor.execute('SELECT email FROM users')
-        email_list=[]
-        em=user_cursor.fetchall()
-        for row in em:
-            email_list.append(row[0])
-        user_conn.commit()
-        return email_list
-    
-    
-
 
     def login():
         with st.form(key='login', clear_on_submit=True):
@@ -47,35 +35,40 @@ def main():
             btn3=st.form_submit_button('Login')
             
             if btn3:
-                email_lst=get_user_emails()
-                if email in email_lst:
-                    user_cursor.execute('SELECT email,password FROM users WHERE email=?',(email,))
-                    records = user_cursor.fetchall()
-                    # print("Printing ID ", records)
-                    saved_pass=eval(records[0][1])
-                    password=str.encode(password1)
-                    if bcrypt.checkpw(password, saved_pass):
+                attempt_key = "login:" + normalize_email(email)
+                ip = client_ip()
+                if not allow_attempt(attempt_key, ip):
+                    st.warning("Too many login attempts, please try again in a few minutes")
+                    return
+                # One indexed lookup answers both "does it exist" and "what is the hash"
+                record = get_user(email)
+                if record is not None:
+                    try:
+                        # Hashing runs on a bounded worker pool, not on this script thread
+                        matches, needs_rehash = verify_password(password1, record[1])
+                    except HashingBusy:
+                        st.warning("Server is busy, please try again in a moment")
+                        return
+                    if matches:
+                        reset_attempts(attempt_key)
+                        if needs_rehash:
+                            # Old storage format or cost factor: upgrade while we have the password
+                            try:
+                                update_password(record[0], hash_password(password1))
+                            except HashingBusy:
+                                pass
                         st.success("Logged In")
                         st.session_state['is_logged'] = True
-                        st.session_state['user']=email
+                        st.session_state['user']=record[0]
                     else:
+                        record_failure(ip)
                         st.warning("Wrong Password")                
                     
                 else:
+                    record_failure(ip)
                     st.warning('Email is not correct')
 
     def sign_up():
-        user_conn = sqlite3.connect('users.db')
-        user_cursor = user_conn.cursor()
-        user_cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER AUTO_INCREMENT PRIMARY KEY,
-                email TEXT UNIQUE,
-                password TEXT
-            )
-        ''')
-        user_conn.commit()
-
         def validate_email(email):
             """
             Check Email Validity
@@ -100,18 +93,25 @@ def main():
             if btn3:
                 if email:
                     if validate_email(email):
-                        if email not in get_user_emails():
+                        if not email_exists(email):
                             if len(password1) >= 6:
                                 if password1 == password2:
                                     # Add User to DB
-                                    password=str.encode(password2)
-                                    hashed_password = bcrypt.hashpw(password, salt)
-
-                                    user_cursor.execute('INSERT INTO users (email, password) VALUES (?, ?)', (email, str(hashed_password)))
-                                    user_conn.commit()
-                                    get_user_emails()
-                                    st.success('Account created successfully!! Great Now You Can login with registered email')
-                                    return True
+                                    ip = client_ip()
+                                    if not allow_attempt("signup:" + normalize_email(email), ip):
+                                        st.warning("Too many attempts, please try again in a few minutes")
+                                        return
+                                    try:
+                                        hashed_password = hash_password(password2)
+                                    except HashingBusy:
+                                        st.warning("Server is busy, please try again in a moment")
+                                        return
+
+                                    if create_user(email, hashed_password):
+                                        st.success('Account created successfully!! Great Now You Can login with registered email')
+                                        return True
+                                    record_failure(ip)
+                                    st.warning('Email Already exists!!')
                                 else:
                                     st.warning('Passwords Do Not Match')
                             else:
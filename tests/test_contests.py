@@ -0,0 +1,141 @@
+"""
+Behaviour of the contest service and its source adapters against the
+recorded upstream responses in src/fixtures/contests, with a transport that
+fails or hangs on demand.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from utils.contests import (
+    CodeChefSource,
+    CodeforcesSource,
+    Contest,
+    ContestService,
+    ContestSource,
+    LeetCodeSource,
+    fixture_get,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), os.pardir, "src", "fixtures", "contests")
+
+
+class Transport:
+    """fixture_get that can be switched to failing or blocking until released."""
+
+    def __init__(self):
+        self.replay = fixture_get(FIXTURES)
+        self.failing = False
+        self.blocking = False
+        self.release = threading.Event()
+
+    def __call__(self, url, timeout):
+        if self.failing:
+            raise ConnectionError("upstream down")
+        if self.blocking:
+            self.release.wait(10)
+        return self.replay(url, timeout)
+
+
+@pytest.fixture
+def transport():
+    transport = Transport()
+    yield transport
+    transport.release.set()
+
+
+def names(snapshot):
+    return {contest.name for contest in snapshot.contests}
+
+
+def test_fixtures_are_parsed_and_merged(transport):
+    snapshot = ContestService(get=transport, ttl=0).get_contests()
+    assert snapshot.version == 1
+    assert {"Starters 211", "Starters 212"} <= names(snapshot)
+    # Codeforces names lose the "Enter »" / "Virtual participation »" links
+    assert {"Codeforces Round 1062 (Div. 2)", "Educational Codeforces Round 184 (Rated for Div. 2)"} <= names(snapshot)
+    starts = [contest.start for contest in snapshot.contests]
+    assert all(start.tzinfo is not None for start in starts)
+    assert starts == sorted(starts)
+
+
+def test_failing_sources_keep_last_good_result(transport):
+    service = ContestService(get=transport, ttl=0)
+    first = service.refresh()
+    transport.failing = True
+    second = service.refresh()
+    assert second.version == first.version + 1
+    assert names(second) == names(first)
+
+
+def test_slow_sources_are_dropped_after_their_timeout(transport):
+    transport.blocking = True
+    service = ContestService(get=transport, timeout=0.2)
+    began = time.perf_counter()
+    snapshot = service.refresh()
+    assert time.perf_counter() - began < 3
+    assert "Starters 211" not in names(snapshot)
+
+
+def test_stale_snapshot_is_served_while_refreshing(transport):
+    service = ContestService(get=transport, ttl=0)
+    first = service.get_contests()
+
+    transport.blocking = True
+    began = time.perf_counter()
+    assert service.get_contests() is first
+    # A refresh is already in flight, so this does not wait either
+    assert service.get_contests() is first
+    assert time.perf_counter() - began < 0.5
+
+    transport.release.set()
+    deadline = time.time() + 5
+    while service.get_contests().version == first.version and time.time() < deadline:
+        time.sleep(0.01)
+    assert service.get_contests().version > first.version
+
+
+def test_codechef_source_reads_iso_starts():
+    contests = CodeChefSource().fetch(fixture_get(FIXTURES), 1)
+    assert [c.name for c in contests] == ["Starters 211", "Starters 212"]
+    assert contests[0].start.isoformat() == "2026-10-22T20:00:00+05:30"
+    assert {c.platform for c in contests} == {"CodeChef"}
+
+
+def test_codeforces_source_cleans_names_and_reads_offset():
+    contests = CodeforcesSource().fetch(fixture_get(FIXTURES), 1)
+    assert [c.name for c in contests] == [
+        "Codeforces Round 1062 (Div. 2)",
+        "Educational Codeforces Round 184 (Rated for Div. 2)",
+    ]
+    assert contests[0].start.isoformat() == "2026-10-21T17:35:00+03:00"
+
+
+def test_weekly_source_schedules_future_aware_starts():
+    contests = LeetCodeSource().fetch(None, 1)
+    now = datetime.now(timezone.utc)
+    assert len(contests) == len(LeetCodeSource.schedule) * LeetCodeSource.weeks
+    assert all(c.start.tzinfo is not None and c.start > now for c in contests)
+
+
+def test_custom_source_is_merged(transport):
+    class FixedSource(ContestSource):
+        name = "Fixed"
+
+        def fetch(self, get, timeout):
+            start = datetime(2026, 10, 20, 12, 0, tzinfo=timezone.utc)
+            return [Contest(self.name, "Fixed Cup", start, "https://example.com", "")]
+
+    snapshot = ContestService(sources=[FixedSource(), CodeChefSource()], get=transport).get_contests()
+    assert [c.name for c in snapshot.contests] == ["Fixed Cup", "Starters 211", "Starters 212"]
+
+
+def test_source_without_fetch_cannot_be_created():
+    class Broken(ContestSource):
+        name = "Broken"
+
+    with pytest.raises(TypeError):
+        Broken()
@@ -0,0 +1,52 @@
+"""
+Section splitting of extracted resume text: headings must start sections,
+and names, job titles and employers must stay in the section they are in.
+"""
+import pytest
+
+from utils.resume_sections import heading_section, split_sections
+
+
+@pytest.mark.parametrize("line, section", [
+    ("EDUCATION", "education"),
+    ("Technical Skills:", "skills"),
+    ("Skills & Interests", "skills"),
+    ("Work Experience & Internships", "experience"),
+    ("Academic Projects", "projects"),
+    ("Volunteer Work", "other"),
+])
+def test_headings(line, section):
+    assert heading_section(line) == section
+
+
+@pytest.mark.parametrize("line", [
+    "JOHN DOE", "SOFTWARE ENGINEER", "GOOGLE", "TCS", "IIT BOMBAY",
+    "Project Manager", "Project Lead", "Senior Tools Engineer", "Career Fair Volunteer",
+    "Python, Java, SQL", "HTML",
+])
+def test_content_lines(line):
+    assert heading_section(line) is None
+
+
+def test_job_titles_and_employers_stay_in_experience():
+    sections = split_sections(
+        "EXPERIENCE\nSOFTWARE ENGINEER\nGOOGLE\n- built search\nProject Manager\nTCS\n- led a team\n"
+        "EDUCATION\nIIT BOMBAY\nB.Tech\n"
+    )
+    assert list(sections) == ["experience", "education"]
+    assert sections["experience"].splitlines() == [
+        "SOFTWARE ENGINEER", "GOOGLE", "- built search", "Project Manager", "TCS", "- led a team",
+    ]
+    assert sections["education"] == "IIT BOMBAY\nB.Tech"
+
+
+def test_name_line_is_profile():
+    sections = split_sections("JOHN DOE\n\njohn@example.com\nSkills\nPython\n")
+    assert sections["profile"] == "JOHN DOE\njohn@example.com"
+    assert sections["skills"] == "Python"
+
+
+def test_isolated_unknown_heading_closes_section():
+    sections = split_sections("Skills\nPython\n\nOPEN SOURCE\n\nFixed a parser bug\n")
+    assert sections["skills"] == "Python"
+    assert sections["other"] == "Fixed a parser bug"
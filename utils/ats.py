@@ -0,0 +1,249 @@
+"""
+Resume evaluation for the ATS page, one resume or a whole batch.
+
+Every resume is first pre-scored locally (utils/keyword_match.py), which
+gives the match percentage and missing keywords with no model call. The
+LLM is only asked for the narrative evaluation of the resumes that rank
+highest, so a batch of hundreds costs a handful of calls.
+
+A batch is pipelined: resumes are extracted in parallel across processes
+and pre-scored as each file finishes, then the top ones go through a
+bounded RequestPool. Scores are yielded as they arrive (a resume is yielded
+again once its AI review is in), which lets the page re-rank its table
+progressively.
+
+Model replies are validated into an Evaluation. The extractor tolerates
+markdown fences, prose around the object, trailing commas and typographic
+quotes; a reply that still does not validate is sent back to the model with
+the reason, a bounded number of times, reusing the prompt that was already
+built (no re-extraction, no fresh evaluation). Only valid replies are
+cached, and parse failures of replies that came from the model (not from
+the cache) are counted in parse_stats().
+"""
+import json
+import re
+import threading
+from collections import namedtuple
+from concurrent.futures import as_completed
+
+from utils.keyword_match import description_keywords, prescore
+from utils.pdf_text import iter_documents
+from utils.request_pool import RequestPool
+from utils.response_cache import get_response_cache, model_id, response_key
+
+PERCENT_RE = re.compile(r"(\d+(?:\.\d+)?)")
+FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+SMART_QUOTES = str.maketrans({"\u201c": '"', "\u201d": '"', "\u2018": "'", "\u2019": "'"})
+DEFAULT_REVIEW_TOP = 5
+MAX_REPAIRS = 2
+
+# match and missing come from the local pre-score (match is in [0, 100], or
+# None when the resume could not be scored); ai_match and summary are filled
+# in for resumes the LLM reviewed
+Score = namedtuple("Score", ["index", "source", "match", "missing", "ai_match", "summary", "error"])
+
+
+def build_prompt(resume_text, description):
+    return f'''
+                You're a skilled ATS (Applicant Tracking System) Scanner with a deep understanding of tech roles, software development,
+                tech consulting, and understand the ATS role in-depth. Your task is to evaluate the resume against the given description.
+                You must consider that the job market is crowded with applications and you should only pick the best talent.
+                Thus, assign the percentage & MissingKeywords with honesty & accuracy
+                resume: {resume_text}
+                description: {description}
+                I want a output in one single string having the structure: {{"PercentageMatch": "%", "MissingKeywordsintheResume": [], "ProfileSummary": ""}}.
+                '''
+
+
+class EvaluationError(ValueError):
+    pass
+
+
+# match is a float in [0, 100]
+Evaluation = namedtuple("Evaluation", ["match", "missing_keywords", "profile_summary"])
+
+
+def extract_json(response_text):
+    """
+    The first JSON object in a model reply, ignoring fences and prose around it.
+    :raise EvaluationError: if there is none
+    """
+    # Typographic quotes and trailing commas are only repaired when the reply
+    # does not parse as is, since valid JSON strings may contain either
+    decoder = json.JSONDecoder()
+    texts = [response_text, response_text.translate(SMART_QUOTES)]
+    for text in texts + [TRAILING_COMMA_RE.sub(r"\1", text) for text in texts]:
+        for candidate in FENCE_RE.findall(text) + [text]:
+            for start in (i for i, char in enumerate(candidate) if char == "{"):
+                try:
+                    value, _ = decoder.raw_decode(candidate, start)
+                except ValueError:
+                    continue
+                if isinstance(value, dict):
+                    return value
+    raise EvaluationError("the reply contains no JSON object")
+
+
+def validate_evaluation(data):
+    """
+    :return: Evaluation
+    :raise EvaluationError: listing every field that is missing or malformed
+    """
+    problems = []
+    match = match_percent(data.get("PercentageMatch")) if "PercentageMatch" in data else None
+    if match is None:
+        problems.append('"PercentageMatch" must be a percentage like "75%"')
+
+    missing = data.get("MissingKeywordsintheResume")
+    if isinstance(missing, str):
+        missing = [k.strip() for k in missing.split(",") if k.strip()]
+    if not isinstance(missing, list) or not all(isinstance(k, (str, int, float)) for k in missing):
+        problems.append('"MissingKeywordsintheResume" must be a list of strings')
+        missing = []
+
+    summary = data.get("ProfileSummary")
+    if not isinstance(summary, str) or not summary.strip():
+        problems.append('"ProfileSummary" must be a non-empty string')
+
+    if problems:
+        raise EvaluationError("; ".join(problems))
+    return Evaluation(match, [str(k) for k in missing], summary.strip())
+
+
+def parse_evaluation(response_text):
+    """
+    :return: Evaluation
+    :raise EvaluationError: when the reply has no valid evaluation
+    """
+    return validate_evaluation(extract_json(response_text))
+
+
+def match_percent(value):
+    """'85%', '85', 85 -> 85.0; anything without a number -> None."""
+    match = PERCENT_RE.search(str(value))
+    return min(100.0, float(match.group(1))) if match else None
+
+
+def build_repair_prompt(prompt, response_text, error):
+    return f"""{prompt}
+                Your previous reply could not be used: {error}.
+                Previous reply: {response_text}
+                Reply again with only the JSON object, no markdown and no other text, with exactly the keys
+                "PercentageMatch" (a string like "75%"), "MissingKeywordsintheResume" (a list of strings)
+                and "ProfileSummary" (a string).
+                """
+
+
+_stats = {"replies": 0, "parse_failures": 0, "repaired": 0, "gave_up": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(**increments):
+    with _stats_lock:
+        for name, amount in increments.items():
+            _stats[name] += amount
+
+
+def parse_stats():
+    """Model replies parsed, how many failed to parse and how those ended."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["failure_rate"] = stats["parse_failures"] / stats["replies"] if stats["replies"] else 0.0
+    return stats
+
+
+def _parses(response_text):
+    try:
+        parse_evaluation(response_text)
+        return True
+    except EvaluationError:
+        return False
+
+
+def evaluate(provider, model, resume_text, description, max_repairs=MAX_REPAIRS):
+    """
+    Evaluate one resume, answered from the response cache when the same
+    resume was evaluated against the same description before. A reply that
+    does not validate is re-asked up to `max_repairs` times; a repaired reply
+    is cached under the original prompt.
+    :return: Evaluation
+    :raise EvaluationError: if no valid reply came back; provider errors propagate
+    """
+    prompt = build_prompt(resume_text, description)
+    model_name = model_id(provider, model)
+    cache = get_response_cache()
+    key = response_key(model_name, None, prompt)
+    called = []
+
+    def produce():
+        called.append(True)
+        return provider.generate(prompt, model)
+
+    response_text = cache.generate(key, model_name, produce, "ats", accept=_parses)
+
+    for attempt in range(max_repairs + 1):
+        # parse_stats() is about what the model sends, so cache hits are not counted
+        from_model = attempt > 0 or bool(called)
+        try:
+            evaluation = parse_evaluation(response_text)
+        except EvaluationError as e:
+            _count(replies=int(from_model), parse_failures=int(from_model))
+            if attempt == max_repairs:
+                _count(gave_up=1)
+                raise EvaluationError(f"no valid evaluation after {max_repairs} repairs: {e}") from e
+            response_text = provider.generate(build_repair_prompt(prompt, response_text, e), model)
+            continue
+        _count(replies=int(from_model), repaired=1 if attempt else 0)
+        if attempt:
+            cache.put(key, model_name, response_text)
+        return evaluation
+
+
+def iter_scores(pdf_docs, description, model, provider, review_top=DEFAULT_REVIEW_TOP, pool=None):
+    """
+    Evaluate every resume against one description.
+    :param review_top: how many of the best pre-scored resumes the LLM reviews
+    :param pool: RequestPool bounding concurrent model calls; one sized from
+        COLLEGE_AI_REQUEST_WORKERS, retrying the provider's transient errors,
+        is created for the batch if not given
+    :return: iterator of Score; each resume once pre-scored, as its file is
+        extracted, then the reviewed ones again, as their reviews complete
+    """
+    keywords = description_keywords(description)
+    texts = {}
+    scores = []
+    for doc in iter_documents(pdf_docs):
+        if doc.error or not doc.text.strip():
+            score = Score(doc.index, doc.source, None, [], None, "", doc.error or "No text found in PDF")
+        else:
+            local = prescore(doc.text, keywords)
+            texts[doc.index] = doc.text
+            score = Score(doc.index, doc.source, local.match, local.missing, None, "", None)
+        scores.append(score)
+        yield score
+
+    top = [score for score in rank(scores) if score.index in texts][:review_top]
+    if not top:
+        return
+    own_pool = pool is None
+    if own_pool:
+        pool = RequestPool(is_transient=provider.is_transient)
+    try:
+        futures = {pool.submit(evaluate, provider, model, texts[score.index], description): score for score in top}
+        for future in as_completed(futures):
+            score = futures[future]
+            try:
+                evaluation = future.result()
+                score = score._replace(ai_match=evaluation.match, summary=evaluation.profile_summary)
+            except Exception as e:
+                score = score._replace(summary=f"AI review failed: {type(e).__name__}: {e}")
+            yield score
+    finally:
+        if own_pool:
+            pool.shutdown()
+
+
+def rank(scores):
+    """Best match first; unscored resumes last, in upload order."""
+    return sorted(scores, key=lambda s: (s.match is None, -(s.match or 0), s.index))
@@ -0,0 +1,9 @@
+"""
+Where the on-disk caches (embeddings, responses, vector indexes) live.
+
+Kept free of third-party imports so light pages can locate their caches
+without loading langchain.
+"""
+import os
+
+CACHE_DIR = os.getenv("COLLEGE_AI_CACHE_DIR", ".cache")
@@ -0,0 +1,263 @@
+"""
+Contest aggregation service for the Contest Calendar page.
+
+Every platform is a ContestSource adapter that yields Contest records with a
+timezone-aware start time, so merging, sorting and rendering work on native
+datetimes. Add a platform by subclassing ContestSource (or WeeklySource for
+fixed weekly schedules) and appending an instance to SOURCES.
+
+All sources are fetched concurrently, each with its own timeout, and the
+merged list is kept in a TTL cache shared by every session in the process.
+Once the cache is older than `ttl` the next page view gets the cached list
+immediately while a background thread refreshes it (stale-while-revalidate),
+so only the very first view of a fresh process waits on the network. A
+source that fails or times out keeps its last good result.
+
+Set COLLEGE_AI_CONTEST_FIXTURES to a directory of recorded upstream
+responses (see src/fixtures/contests) to run without network access.
+"""
+import abc
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, time as clock, timedelta, timezone
+from typing import NamedTuple
+
+import requests
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 15 * 60
+DEFAULT_TIMEOUT = 5.0
+IST = timezone(timedelta(hours=5, minutes=30), "IST")
+# Timezone the calendar is shown in
+DISPLAY_TZ = IST
+
+Snapshot = namedtuple("Snapshot", ["version", "fetched_at", "contests"])
+
+
+class Contest(NamedTuple):
+    platform: str
+    name: str
+    start: datetime  # always timezone-aware
+    link: str
+    icon: str
+
+
+def http_get(url, timeout):
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+def fixture_get(directory):
+    """Transport that replays recorded responses instead of hitting the network."""
+    files = {source.url: source.fixture for source in SOURCES if source.url}
+
+    def get(url, timeout):
+        with open(os.path.join(directory, files[url]), encoding="utf-8") as f:
+            return f.read()
+    return get
+
+
+class ContestSource(abc.ABC):
+    name = ""
+    icon = ""
+    # Upstream URL and the recorded response replayed by fixture_get, if any
+    url = None
+    fixture = None
+
+    @abc.abstractmethod
+    def fetch(self, get, timeout):
+        """
+        :param get: transport, get(url, timeout) -> response text
+        :return: list of Contest
+        """
+
+
+class WeeklySource(ContestSource):
+    """Contests that run every week at a fixed local time."""
+
+    # (contest name, weekday with Monday == 0, local start time, link)
+    schedule = ()
+    tz = IST
+    weeks = 2
+
+    def fetch(self, get, timeout):
+        now = datetime.now(self.tz)
+        contests = []
+        for contest_name, weekday, start, link in self.schedule:
+            day = now.date()
+            found = 0
+            while found < self.weeks:
+                day += timedelta(days=1)
+                if day.weekday() == weekday:
+                    found += 1
+                    contests.append(Contest(self.name, contest_name, datetime.combine(day, start, self.tz), link, self.icon))
+        return contests
+
+
+class GFGSource(WeeklySource):
+    name = "GeeksforGeeks"
+    icon = "https://media.geeksforgeeks.org/wp-content/cdn-uploads/20210420155809/gfg-new-logo.png"
+    schedule = (
+        ("Weekly Contest", 6, clock(19, 0), "https://www.geeksforgeeks.org/events/rec/gfg-weekly-coding-contest"),
+    )
+
+
+class LeetCodeSource(WeeklySource):
+    name = "LeetCode"
+    icon = "https://upload.wikimedia.org/wikipedia/commons/thumb/0/0a/LeetCode_Logo_black_with_text.svg/458px-LeetCode_Logo_black_with_text.svg.png"
+    schedule = (
+        ("Weekly Contest", 6, clock(8, 0), "https://leetcode.com/contest/"),
+        ("Biweekly Contest", 5, clock(20, 0), "https://leetcode.com/contest/"),
+    )
+
+
+class CodeChefSource(ContestSource):
+    name = "CodeChef"
+    icon = "https://cdn.codechef.com/sites/all/themes/abessive/cc-logo.png"
+    url = "https://www.codechef.com/api/list/contests/all?sort_by=START&sorting_order=asc&offset=0&mode=all"
+    fixture = "codechef.json"
+
+    def fetch(self, get, timeout):
+        data = json.loads(get(self.url, timeout))
+        contests = []
+        for item in data["future_contests"]:
+            if item.get("contest_start_date_iso"):
+                start = datetime.fromisoformat(item["contest_start_date_iso"])
+            else:
+                # Older responses only carry the local (IST) time
+                start = datetime.strptime(item["contest_start_date"], "%d %b %Y %H:%M:%S").replace(tzinfo=IST)
+            contests.append(Contest(self.name, item["contest_name"], start, "https://www.codechef.com/contests", self.icon))
+        return contests
+
+
+class CodeforcesSource(ContestSource):
+    name = "Codeforces"
+    icon = "https://asset.brandfetch.io/idMR4CMjcL/idPWmM8aOc.png?updated=1716797858256"
+    url = "https://codeforces.com/contests"
+    fixture = "codeforces.html"
+    # Anonymous visitors see Moscow time unless the page says otherwise
+    default_tz = timezone(timedelta(hours=3))
+    offset_re = re.compile(r"UTC([+-]\d+(?:\.\d+)?)")
+
+    def fetch(self, get, timeout):
+        soup = BeautifulSoup(get(self.url, timeout), "html.parser")
+        contests = []
+        for row in soup.find_all("div", {"class": "datatable"})[0].find_all("tr"):
+            columns = row.find_all("td")
+            if len(columns) != 6:
+                continue
+            name = (
+                columns[0]
+                .text.strip()
+                .replace("Enter", " ")
+                .replace("Virtual participation", " ")
+                .replace("\u00bb", " ")
+            )
+            name = " ".join(line.strip() for line in name.splitlines() if line.strip())
+            start_text = columns[2].text.strip()
+            offset = self.offset_re.search(start_text)
+            tz = timezone(timedelta(hours=float(offset.group(1)))) if offset else self.default_tz
+            start = datetime.strptime(start_text[:17], "%b/%d/%Y %H:%M").replace(tzinfo=tz)
+            contests.append(Contest(self.name, name, start, self.url, self.icon))
+        return contests
+
+
+SOURCES = [GFGSource(), LeetCodeSource(), CodeChefSource(), CodeforcesSource()]
+
+
+class ContestService:
+    def __init__(self, sources=None, get=None, ttl=DEFAULT_TTL, timeout=DEFAULT_TIMEOUT):
+        self.sources = {source.name: source for source in (sources or SOURCES)}
+        self.get = get or http_get
+        self.ttl = ttl
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=2 * len(self.sources) + 1, thread_name_prefix="contests")
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._snapshot = None
+        self._last_good = {}
+
+    def get_contests(self):
+        """
+        Current snapshot. Blocks only when nothing has been fetched yet;
+        afterwards a stale snapshot is returned at once and refreshed in the
+        background.
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            stale = snapshot is not None and time.time() - snapshot.fetched_at > self.ttl
+            start_background = stale and not self._refreshing
+            if start_background:
+                self._refreshing = True
+        if snapshot is None:
+            return self.refresh()
+        if start_background:
+            self._executor.submit(self._background_refresh)
+        return snapshot
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("Background contest refresh failed")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def refresh(self):
+        """Fetch every source concurrently and publish a new snapshot."""
+        began = time.perf_counter()
+        futures = {
+            self._executor.submit(source.fetch, self.get, self.timeout): name
+            for name, source in self.sources.items()
+        }
+        # The per-request timeout bounds each source; this bounds the whole refresh
+        done, not_done = wait(futures, timeout=self.timeout + 1)
+
+        results = {}
+        for future, name in futures.items():
+            if future in not_done:
+                logger.warning("Contest source %s timed out", name)
+                future.cancel()
+                continue
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.warning("Contest source %s failed: %s", name, e)
+
+        with self._lock:
+            self._last_good.update(results)
+            merged = sorted(
+                {c for contests in self._last_good.values() for c in contests},
+                key=lambda c: (c.start, c.platform, c.name),
+            )
+            version = self._snapshot.version + 1 if self._snapshot else 1
+            self._snapshot = Snapshot(version, time.time(), merged)
+            snapshot = self._snapshot
+        logger.info("Refreshed %d contests from %d/%d sources in %.2fs",
+                    len(merged), len(results), len(self.sources), time.perf_counter() - began)
+        return snapshot
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_contest_service():
+    """Process-wide service shared by every session."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                fixtures = os.getenv("COLLEGE_AI_CONTEST_FIXTURES")
+                _service = ContestService(get=fixture_get(fixtures) if fixtures else None)
+    return _service
@@ -0,0 +1,275 @@
+"""
+Shared SQLite data-access layer for users.db and jobs.db.
+
+Each database gets one bounded connection pool per process. A thread checks
+out a connection for the duration of a `with` block (nested blocks on the
+same thread reuse it), so sessions never share a cursor and never open a
+fresh connection per query. Connections run in WAL mode so readers do not
+block the writer.
+
+Schemas are versioned with PRAGMA user_version: MIGRATIONS holds the
+ordered steps for every database and they are applied once, when the pool
+is created, instead of on every Streamlit rerun.
+"""
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.getenv("COLLEGE_AI_DATA_DIR", ".")
+USERS_DB = "users.db"
+JOBS_DB = "jobs.db"
+DEFAULT_POOL_SIZE = 8
+BUSY_TIMEOUT_MS = 5000
+
+def _add_users_email_key(conn):
+    # Normalized, indexed lookup key; legacy rows that only differ by case
+    # keep a NULL key here so the unique index can still be built, and are
+    # given one by _key_case_duplicate_users
+    conn.execute('ALTER TABLE users ADD COLUMN email_key TEXT')
+    seen = set()
+    for rowid, email in conn.execute('SELECT rowid, email FROM users ORDER BY rowid').fetchall():
+        key = (email or '').strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            conn.execute('UPDATE users SET email_key = ? WHERE rowid = ?', (key, rowid))
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_key ON users (email_key)')
+
+
+def _key_case_duplicate_users(conn):
+    # _add_users_email_key left accounts whose email only differs by case
+    # from an older one without a key. They get their exact, stripped email
+    # as key when it is free; the rest are logged and still found by
+    # user_store's exact-email lookup.
+    rows = conn.execute('SELECT rowid, email FROM users WHERE email_key IS NULL AND email IS NOT NULL').fetchall()
+    for rowid, email in rows:
+        key = email.strip()
+        if key and conn.execute('SELECT 1 FROM users WHERE email_key = ?', (key,)).fetchone() is None:
+            conn.execute('UPDATE users SET email_key = ? WHERE rowid = ?', (key, rowid))
+        else:
+            logger.warning("Account %r has no email key; it can only log in with its exact email", email)
+
+
+def _add_jobs_indexes(conn):
+    # Duplicate links are handled by _add_jobs_unique_link below; this step
+    # no longer deletes rows or builds the unique index itself
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_email_status ON jobs (email, status)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_email_company ON jobs (email, company)')
+
+
+def _add_jobs_unique_link(conn):
+    # check_job only ever rejected duplicates in Python, so concurrent adds
+    # could still store the same link twice. The newest row of each
+    # duplicate group is kept; the others are moved to jobs_duplicates, not
+    # lost. Rows without a link are never merged, and the unique index
+    # (replacing the full one earlier versions of _add_jobs_indexes built)
+    # ignores them.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS jobs_duplicates (
+            application_id INTEGER PRIMARY KEY,
+            email TEXT,
+            job_link TEXT,
+            company TEXT,
+            status TEXT,
+            archived_at INTEGER NOT NULL
+        )
+    ''')
+    duplicates = '''
+        SELECT application_id FROM jobs WHERE job_link IS NOT NULL AND application_id NOT IN (
+            SELECT MAX(application_id) FROM jobs WHERE job_link IS NOT NULL GROUP BY email, job_link
+        )
+    '''
+    moved = conn.execute(f'''
+        INSERT INTO jobs_duplicates (application_id, email, job_link, company, status, archived_at)
+        SELECT application_id, email, job_link, company, status, CAST(strftime('%s', 'now') AS INTEGER)
+        FROM jobs WHERE application_id IN ({duplicates})
+    ''').rowcount
+    if moved:
+        logger.warning("Moved %d duplicate job applications to jobs_duplicates", moved)
+        conn.execute(f'DELETE FROM job_status_history WHERE application_id IN ({duplicates})')
+        conn.execute(f'DELETE FROM jobs WHERE application_id IN ({duplicates})')
+    conn.execute('DROP INDEX IF EXISTS idx_jobs_email_link')
+    conn.execute('CREATE UNIQUE INDEX idx_jobs_email_link ON jobs (email, job_link) WHERE job_link IS NOT NULL')
+
+
+def _add_jobs_status_history(conn):
+    # One row per status an application has been in; rows with a NULL
+    # previous_status mark when the application was added. Existing
+    # applications have no known dates, so they start at migration time.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS job_status_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            application_id INTEGER NOT NULL,
+            email TEXT NOT NULL,
+            previous_status TEXT,
+            status TEXT NOT NULL,
+            changed_at INTEGER NOT NULL
+        )
+    ''')
+    conn.execute('''
+        INSERT INTO job_status_history (application_id, email, previous_status, status, changed_at)
+        SELECT application_id, email, NULL, status, CAST(strftime('%s', 'now') AS INTEGER)
+        FROM jobs ORDER BY application_id
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_history_email ON job_status_history (email)')
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS idx_history_email_application '
+        'ON job_status_history (email, application_id, changed_at)'
+    )
+
+
+# database -> ordered list of migration steps; only ever append to these
+MIGRATIONS = {
+    USERS_DB: [
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER AUTO_INCREMENT PRIMARY KEY,
+            email TEXT UNIQUE,
+            password TEXT
+        )
+        ''',
+        _add_users_email_key,
+        _key_case_duplicate_users,
+    ],
+    JOBS_DB: [
+        '''
+        CREATE TABLE IF NOT EXISTS jobs (
+            application_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT,
+            job_link TEXT,
+            company TEXT,
+            status TEXT
+        )
+        ''',
+        _add_jobs_indexes,
+        # Rows of one user in application_id order, for id-ordered listing and export
+        'CREATE INDEX IF NOT EXISTS idx_jobs_email ON jobs (email)',
+        _add_jobs_status_history,
+        _add_jobs_unique_link,
+    ],
+}
+
+
+def migrate(conn, steps):
+    """
+    Apply the steps the database has not seen yet, each in its own
+    transaction together with the user_version bump.
+    :return: number of steps applied
+    """
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    for number, step in enumerate(steps[version:], start=version + 1):
+        with conn:
+            if callable(step):
+                conn.execute('BEGIN')
+                step(conn)
+            else:
+                conn.executescript('BEGIN;' + step + ';')
+            conn.execute(f'PRAGMA user_version = {number}')
+    return max(len(steps) - version, 0)
+
+
+class ConnectionPool:
+    def __init__(self, path, size=DEFAULT_POOL_SIZE, migrations=()):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        conn = self._connect()
+        migrate(conn, list(migrations))
+        self._idle.put(conn)
+
+    def _connect(self):
+        with self._lock:
+            self._created += 1
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+        return conn
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_create = self._created < self.size
+        if can_create:
+            return self._connect()
+        # Pool exhausted: wait for another thread to give one back
+        return self._idle.get()
+
+    @contextmanager
+    def connection(self):
+        """Check out this thread's connection for the duration of the block."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self._checkout()
+        self._local.conn = conn
+        self._local.depth = 1
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self, immediate=False):
+        """
+        Connection whose work is committed on success and rolled back on error.
+        :param immediate: take the write lock up front, for read-then-write work
+        """
+        with self.connection() as conn:
+            with conn:
+                if immediate and not conn.in_transaction:
+                    conn.execute('BEGIN IMMEDIATE')
+                yield conn
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name):
+    """
+    Process-wide pool for one of the app databases, created (and migrated)
+    on first use.
+    """
+    pool = _pools.get(name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                pool = ConnectionPool(os.path.join(DATA_DIR, name), migrations=MIGRATIONS.get(name, ()))
+                _pools[name] = pool
+    return pool
+
+
+def init_databases():
+    """Create and migrate every app database; called once at startup."""
+    for name in MIGRATIONS:
+        get_pool(name)
@@ -0,0 +1,164 @@
+"""
+Persistent, content-addressed cache for document embeddings.
+
+Vectors are stored in a small SQLite file keyed by (model name, sha256 of
+the chunk text), so a chunk that was embedded once is never sent to the
+embedding API again, no matter which page or which upload it came from.
+The file is size-bounded: once it grows past `max_bytes` the least recently
+used vectors are evicted.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+
+from langchain_core.embeddings import Embeddings
+
+from utils.cache_dir import CACHE_DIR
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path or os.path.join(CACHE_DIR, "embeddings.db")
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, hash)
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)')
+        self._conn.commit()
+
+    def get_many(self, model, hashes):
+        """
+        Look up cached vectors.
+        :return: dict of hash -> vector for the hashes that were found
+        """
+        found = {}
+        if not hashes:
+            return found
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(hashes), 500):
+                batch = hashes[i:i + 500]
+                marks = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f'SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({marks})',
+                    (model, *batch),
+                ).fetchall()
+                for h, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[h] = vector.tolist()
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    'UPDATE embeddings SET last_used = ? WHERE model = ? AND hash = ?',
+                    [(now, model, h) for h in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, model, items):
+        """
+        Store vectors.
+        :param items: iterable of (hash, vector) pairs
+        """
+        now = time.time()
+        rows = [(model, h, array("f", vector).tobytes(), now) for h, vector in items]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO embeddings (model, hash, vector, last_used) VALUES (?, ?, ?, ?)',
+                rows,
+            )
+            self._conn.commit()
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute('SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        cursor = self._conn.execute('SELECT model, hash, LENGTH(vector) FROM embeddings ORDER BY last_used')
+        victims = []
+        for model, h, size in cursor:
+            victims.append((model, h))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany('DELETE FROM embeddings WHERE model = ? AND hash = ?', victims)
+        self._conn.commit()
+
+    def size_bytes(self):
+        with self._lock:
+            return self._conn.execute('SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings').fetchone()[0]
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps any LangChain embeddings object and only forwards chunks that are
+    not in the cache yet.
+    """
+
+    def __init__(self, underlying, model_name, cache=None):
+        self.underlying = underlying
+        self.model_name = model_name
+        self.cache = cache or get_cache()
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts):
+        hashes = [text_hash(t) for t in texts]
+        unique = list(dict.fromkeys(hashes))
+        vectors = self.cache.get_many(self.model_name, unique)
+
+        missing = [h for h in unique if h not in vectors]
+        self.hits += len(unique) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            missing_set = set(missing)
+            texts_by_hash = {}
+            for h, t in zip(hashes, texts):
+                if h in missing_set:
+                    texts_by_hash.setdefault(h, t)
+            new_vectors = self.underlying.embed_documents([texts_by_hash[h] for h in missing])
+            fresh = list(zip(missing, new_vectors))
+            self.cache.put_many(self.model_name, fresh)
+            vectors.update(fresh)
+
+        return [vectors[h] for h in hashes]
+
+    def embed_query(self, text):
+        return self.underlying.embed_query(text)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide cache shared by every page."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache()
+    return _cache
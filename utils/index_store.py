@@ -0,0 +1,172 @@
+"""
+Per-user, per-document FAISS index store.
+
+Each index lives in its own directory, <root>/<owner>/<fingerprint>/, so
+concurrent sessions never overwrite each other. Writes go to a temporary
+directory first and are swapped into place with a rename, so a reader never
+sees a half-written index. Cold indexes are evicted least recently used
+first once the store holds more than `max_indexes`.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+from langchain_community.vectorstores import FAISS
+
+from utils.cache_dir import CACHE_DIR
+
+INDEX_DIR = os.getenv("COLLEGE_AI_INDEX_DIR", os.path.join(CACHE_DIR, "indexes"))
+DEFAULT_MAX_INDEXES = 200
+LAST_USED_FILE = ".last_used"
+MANIFEST_FILE = "manifest.json"
+
+
+def fingerprint(doc_hashes, namespace=""):
+    """
+    Combine per-document hashes into one fingerprint for the whole set.
+    Upload order does not matter.
+    :param namespace: e.g. the embedding model, so indexes built with
+        different models never share a fingerprint
+    """
+    combined = hashlib.sha256(namespace.encode("utf-8"))
+    for h in sorted(doc_hashes):
+        combined.update(h.encode("ascii"))
+    return combined.hexdigest()[:32]
+
+
+def index_owner(session_state):
+    """
+    Key the store by the logged in user, or by a random id that lives as
+    long as the browser session for anonymous visitors.
+    """
+    user = session_state.get('user')
+    if not user:
+        if 'anon_id' not in session_state:
+            session_state['anon_id'] = uuid.uuid4().hex
+        user = "anon-" + session_state['anon_id']
+    return hashlib.sha256(user.lower().encode("utf-8")).hexdigest()[:24]
+
+
+class IndexStore:
+    def __init__(self, root=INDEX_DIR, max_indexes=DEFAULT_MAX_INDEXES):
+        self.root = root
+        self.max_indexes = max_indexes
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, owner, doc_fingerprint):
+        return os.path.join(self.root, owner, doc_fingerprint)
+
+    def exists(self, owner, doc_fingerprint):
+        return os.path.isfile(os.path.join(self.path(owner, doc_fingerprint), "index.faiss"))
+
+    def save(self, vector_store, owner, doc_fingerprint, manifest=None):
+        """
+        Atomically write `vector_store` as the index for (owner, fingerprint).
+        :param manifest: optional JSON-serialisable dict stored with the index,
+            e.g. which docstore ids belong to which document
+        """
+        target = self.path(owner, doc_fingerprint)
+        parent = os.path.dirname(target)
+        os.makedirs(parent, exist_ok=True)
+
+        tmp = os.path.join(parent, f".tmp-{doc_fingerprint}-{uuid.uuid4().hex}")
+        vector_store.save_local(tmp)
+        if manifest is not None:
+            with open(os.path.join(tmp, MANIFEST_FILE), "w") as f:
+                json.dump(manifest, f)
+        self._touch(tmp)
+
+        with self._lock:
+            old = None
+            if os.path.exists(target):
+                old = os.path.join(parent, f".old-{doc_fingerprint}-{uuid.uuid4().hex}")
+                os.rename(target, old)
+            os.rename(tmp, target)
+        if old:
+            shutil.rmtree(old, ignore_errors=True)
+        self.evict()
+        return target
+
+    def version(self, owner, doc_fingerprint):
+        """
+        Identify the current on-disk build of an index; it changes every time
+        the index is saved again.
+        :raises FileNotFoundError: if it was never built or has been evicted
+        """
+        stat = os.stat(os.path.join(self.path(owner, doc_fingerprint), "index.faiss"))
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def touch(self, owner, doc_fingerprint):
+        """Mark an index as recently used so eviction keeps it."""
+        self._touch(self.path(owner, doc_fingerprint))
+
+    def load(self, owner, doc_fingerprint, embeddings):
+        """
+        Load the index for (owner, fingerprint).
+        :raises FileNotFoundError: if it was never built or has been evicted
+        """
+        target = self.path(owner, doc_fingerprint)
+        if not self.exists(owner, doc_fingerprint):
+            raise FileNotFoundError(f"No index for document set {doc_fingerprint}")
+        self._touch(target)
+        return FAISS.load_local(target, embeddings, allow_dangerous_deserialization=True)
+
+    def load_manifest(self, owner, doc_fingerprint):
+        """The manifest saved with an index, or an empty dict if it has none."""
+        try:
+            with open(os.path.join(self.path(owner, doc_fingerprint), MANIFEST_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def delete(self, owner, doc_fingerprint):
+        shutil.rmtree(self.path(owner, doc_fingerprint), ignore_errors=True)
+
+    def evict(self):
+        """Remove the least recently used indexes beyond `max_indexes`."""
+        with self._lock:
+            entries = []
+            for owner in os.listdir(self.root):
+                owner_dir = os.path.join(self.root, owner)
+                if not os.path.isdir(owner_dir):
+                    continue
+                for name in os.listdir(owner_dir):
+                    if name.startswith("."):
+                        continue
+                    entries.append((self._last_used(os.path.join(owner_dir, name)), owner, name))
+            if len(entries) <= self.max_indexes:
+                return
+            entries.sort()
+            for _, owner, name in entries[:len(entries) - self.max_indexes]:
+                shutil.rmtree(os.path.join(self.root, owner, name), ignore_errors=True)
+
+    @staticmethod
+    def _touch(path):
+        with open(os.path.join(path, LAST_USED_FILE), "w") as f:
+            f.write(str(time.time()))
+
+    @staticmethod
+    def _last_used(path):
+        try:
+            return os.path.getmtime(os.path.join(path, LAST_USED_FILE))
+        except OSError:
+            return 0.0
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Process-wide index store shared by every page."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = IndexStore()
+    return _store
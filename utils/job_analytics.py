@@ -0,0 +1,162 @@
+"""
+Status analytics for the Job Tracker, computed in SQL.
+
+Every figure is an aggregate query over the indexed jobs and
+job_status_history tables, so only the summary rows ever reach Python.
+Results are cached per user and keyed by the id of the user's newest
+history row: the history table is append-only and every write to a user's
+applications appends to it, so any write moves the version and the next
+render recomputes. Time spent in an application's current status keeps
+growing without writes, so cached results are also refreshed hourly.
+"""
+import time
+from collections import namedtuple
+
+from utils.db import JOBS_DB, get_pool
+from utils.resource_cache import ResourceCache
+
+# Forward stages of an application; rejected ends it at whatever stage it reached
+FUNNEL = ["applied", "testlink_received", "interviewed", "offered", "accepted"]
+DEFAULT_TOP_COMPANIES = 20
+SECONDS_PER_DAY = 86400
+REFRESH_SECONDS = 3600
+
+Analytics = namedtuple("Analytics", ["funnel", "conversions", "companies", "weekly", "time_in_status"])
+
+_cache = ResourceCache(max_entries=256)
+
+
+def _pool(pool):
+    return pool or get_pool(JOBS_DB)
+
+
+def _funnel_ranks():
+    values = ", ".join("(?, ?)" for _ in FUNNEL)
+    params = [p for rank, status in enumerate(FUNNEL) for p in (status, rank)]
+    return f'ranks(status, rank) AS (VALUES {values})', params
+
+
+def history_version(email, pool=None):
+    """Id of the user's newest history row; changes on every write."""
+    with _pool(pool).connection() as conn:
+        return conn.execute(
+            'SELECT MAX(id) FROM job_status_history WHERE email = ?', (email,)
+        ).fetchone()[0]
+
+
+def status_counts(conn, email):
+    """
+    :return: list of (status, applications currently in it)
+    """
+    return conn.execute(
+        'SELECT status, COUNT(*) FROM jobs WHERE email = ? GROUP BY status ORDER BY COUNT(*) DESC',
+        (email,),
+    ).fetchall()
+
+
+def stage_conversions(conn, email):
+    """
+    How far applications got, from their whole history rather than their
+    current status, so a rejection after an interview still counts as
+    having reached the interview.
+    :return: list of (stage, applications that reached it, share of the
+        previous stage that reached it or None for the first stage)
+    """
+    ranks, params = _funnel_ranks()
+    rows = conn.execute(
+        f'''
+        WITH {ranks},
+        reached AS (
+            SELECT h.application_id, COALESCE(MAX(r.rank), 0) AS top
+            FROM job_status_history h LEFT JOIN ranks r ON r.status = h.status
+            WHERE h.email = ?
+            GROUP BY h.application_id
+        )
+        SELECT r.status, (SELECT COUNT(*) FROM reached WHERE top >= r.rank)
+        FROM ranks r ORDER BY r.rank
+        ''',
+        (*params, email),
+    ).fetchall()
+    conversions = []
+    previous = None
+    for stage, count in rows:
+        rate = None if previous is None else (count / previous if previous else 0.0)
+        conversions.append((stage, count, rate))
+        previous = count
+    return conversions
+
+
+def company_counts(conn, email, limit=DEFAULT_TOP_COMPANIES):
+    """
+    :return: list of (company, applications, interviews or later, offers or later)
+    """
+    return conn.execute(
+        '''
+        SELECT company, COUNT(*),
+               SUM(status IN ('interviewed', 'offered', 'accepted')),
+               SUM(status IN ('offered', 'accepted'))
+        FROM jobs WHERE email = ?
+        GROUP BY company ORDER BY COUNT(*) DESC, company COLLATE NOCASE LIMIT ?
+        ''',
+        (email, limit),
+    ).fetchall()
+
+
+def weekly_counts(conn, email):
+    """
+    Applications added per week (weeks start on Monday, UTC).
+    :return: list of (week start date 'YYYY-MM-DD', applications)
+    """
+    return conn.execute(
+        '''
+        SELECT date(changed_at, 'unixepoch', 'weekday 0', '-6 days') AS week, COUNT(*)
+        FROM job_status_history
+        WHERE email = ? AND previous_status IS NULL
+        GROUP BY week ORDER BY week
+        ''',
+        (email,),
+    ).fetchall()
+
+
+def status_durations(conn, email, now=None):
+    """
+    Time spent in each status, from one history row to the next; the
+    current status of an application counts up to `now`.
+    :return: list of (status, stays, average days, max days)
+    """
+    now = int(time.time()) if now is None else now
+    return conn.execute(
+        '''
+        WITH spans AS (
+            SELECT status,
+                   COALESCE(LEAD(changed_at) OVER (
+                       PARTITION BY application_id ORDER BY changed_at, id
+                   ), ?) - changed_at AS seconds
+            FROM job_status_history WHERE email = ?
+        )
+        SELECT status, COUNT(*), AVG(seconds) / ?, MAX(seconds) / ?
+        FROM spans GROUP BY status ORDER BY AVG(seconds) DESC
+        ''',
+        (now, email, float(SECONDS_PER_DAY), float(SECONDS_PER_DAY)),
+    ).fetchall()
+
+
+def compute_analytics(email, pool=None):
+    with _pool(pool).connection() as conn:
+        return Analytics(
+            funnel=status_counts(conn, email),
+            conversions=stage_conversions(conn, email),
+            companies=company_counts(conn, email),
+            weekly=weekly_counts(conn, email),
+            time_in_status=status_durations(conn, email),
+        )
+
+
+def get_analytics(email, pool=None):
+    """
+    Cached analytics for one user, recomputed after any write to their
+    applications.
+    """
+    pool = _pool(pool)
+    version = (history_version(email, pool), int(time.time()) // REFRESH_SECONDS)
+    return _cache.get(("job_analytics", pool.path, email), lambda: compute_analytics(email, pool), version=version)
@@ -0,0 +1,246 @@
+"""
+Queries for the Job Tracker's jobs table.
+
+Duplicates are rejected by the unique (email, job_link) index instead of by
+scanning a user's links in Python, and the listing is paginated, sorted and
+filtered in SQL so a page only ever loads the rows it shows.
+
+Bulk import validates every row first and then inserts all valid rows in a
+single transaction with batched statements, letting the same unique index
+count duplicates. Export streams a user's rows in id order, one batch per
+query, so it never holds a connection between batches.
+
+Every insert and status change is also appended to job_status_history in
+the same transaction, which is what the analytics in
+utils/job_analytics.py are computed from.
+"""
+import csv
+import io
+import json
+import time
+from collections import namedtuple
+
+from utils.db import JOBS_DB, get_pool
+
+STATUSES = ["applied", "testlink_received", "interviewed", "offered", "rejected", "accepted"]
+# user facing sort option -> ORDER BY clause; never interpolate anything else
+SORT_COLUMNS = {
+    "Newest": "application_id DESC",
+    "Oldest": "application_id ASC",
+    "Company": "company COLLATE NOCASE ASC, application_id DESC",
+    "Status": "status ASC, application_id DESC",
+}
+
+
+def _pool(pool):
+    return pool or get_pool(JOBS_DB)
+
+
+def _now():
+    return int(time.time())
+
+
+def add_job(email, job_link, company, status, pool=None):
+    """
+    :return: False if the user already tracks this job link
+    """
+    with _pool(pool).transaction() as conn:
+        cursor = conn.execute(
+            'INSERT INTO jobs (email, job_link, company, status) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (email, job_link) WHERE job_link IS NOT NULL DO NOTHING',
+            (email, job_link, company, status),
+        )
+        if cursor.rowcount != 1:
+            return False
+        conn.execute(
+            'INSERT INTO job_status_history (application_id, email, previous_status, status, changed_at) '
+            'VALUES (?, ?, NULL, ?, ?)',
+            (cursor.lastrowid, email, status, _now()),
+        )
+    return True
+
+
+def update_status(email, application_id, status, pool=None):
+    """
+    Change an application's status and record the transition. Setting the
+    status it already has records nothing.
+    :return: False if the user has no application with that id
+    """
+    with _pool(pool).transaction(immediate=True) as conn:
+        row = conn.execute(
+            'SELECT status FROM jobs WHERE email = ? AND application_id = ?',
+            (email, application_id),
+        ).fetchone()
+        if row is None:
+            return False
+        if row[0] != status:
+            conn.execute(
+                'UPDATE jobs SET status = ? WHERE email = ? AND application_id = ?',
+                (status, email, application_id),
+            )
+            conn.execute(
+                'INSERT INTO job_status_history (application_id, email, previous_status, status, changed_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (application_id, email, row[0], status, _now()),
+            )
+    return True
+
+
+def _where(email, status):
+    if status:
+        return 'WHERE email = ? AND status = ?', (email, status)
+    return 'WHERE email = ?', (email,)
+
+
+def count_jobs(email, status=None, pool=None):
+    where, params = _where(email, status)
+    with _pool(pool).connection() as conn:
+        return conn.execute(f'SELECT COUNT(*) FROM jobs {where}', params).fetchone()[0]
+
+
+def list_jobs(email, status=None, sort="Newest", limit=25, offset=0, pool=None):
+    """
+    One page of a user's applications.
+    :return: list of (application_id, job_link, company, status)
+    """
+    where, params = _where(email, status)
+    order_by = SORT_COLUMNS[sort]
+    with _pool(pool).connection() as conn:
+        return conn.execute(
+            f'SELECT application_id, job_link, company, status FROM jobs {where} '
+            f'ORDER BY {order_by} LIMIT ? OFFSET ?',
+            (*params, limit, offset),
+        ).fetchall()
+
+
+EXPORT_COLUMNS = ["application_id", "job_link", "company", "status"]
+BATCH_SIZE = 1000
+
+# line is 1-based and counts the CSV header, so it matches what a spreadsheet shows
+ImportResult = namedtuple("ImportResult", ["inserted", "duplicates", "errors"])
+
+
+def _normalize_key(key):
+    return (key or "").strip().lower().replace(" ", "_")
+
+
+def read_rows(data, fmt):
+    """
+    Parse an uploaded file into dicts with normalized keys.
+    :param data: file contents as bytes
+    :param fmt: "csv", "json" (array of objects) or "jsonl"
+    :return: iterator of (line number, row dict)
+    """
+    text = data.decode("utf-8-sig")
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        for line, row in enumerate(reader, start=2):
+            yield line, {_normalize_key(k): v for k, v in row.items()}
+    elif fmt == "json":
+        rows = json.loads(text)
+        if not isinstance(rows, list):
+            raise ValueError(f"expected a JSON array of applications, got a {type(rows).__name__}")
+        for line, row in enumerate(rows, start=1):
+            yield line, {_normalize_key(k): v for k, v in row.items()} if isinstance(row, dict) else row
+    elif fmt == "jsonl":
+        for line, raw in enumerate(text.splitlines(), start=1):
+            if raw.strip():
+                row = json.loads(raw)
+                yield line, {_normalize_key(k): v for k, v in row.items()} if isinstance(row, dict) else row
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def validate_row(row):
+    """
+    :return: (job_link, company, status), or an error message string
+    """
+    if not isinstance(row, dict):
+        return "row is not an object"
+    job_link = str(row.get("job_link") or "").strip()
+    if not job_link:
+        return "job_link is required"
+    company = str(row.get("company") or "").strip()
+    status = str(row.get("status") or "applied").strip().lower()
+    if status not in STATUSES:
+        return f"unknown status '{status}'"
+    return job_link, company, status
+
+
+def import_jobs(email, rows, batch_size=BATCH_SIZE, pool=None):
+    """
+    Validate and insert many applications in one transaction.
+    :param rows: iterable of (line number, row dict), e.g. from read_rows()
+    :return: ImportResult; invalid rows are reported, not inserted
+    """
+    valid = []
+    errors = []
+    for line, row in rows:
+        checked = validate_row(row)
+        if isinstance(checked, str):
+            errors.append((line, checked))
+        else:
+            valid.append((email, *checked))
+
+    inserted = 0
+    with _pool(pool).transaction(immediate=True) as conn:
+        # ids only grow and the transaction holds the write lock, so every row
+        # above this id is one of ours
+        last_id = conn.execute('SELECT COALESCE(MAX(application_id), 0) FROM jobs').fetchone()[0]
+        for i in range(0, len(valid), batch_size):
+            before = conn.total_changes
+            conn.executemany(
+                'INSERT INTO jobs (email, job_link, company, status) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (email, job_link) WHERE job_link IS NOT NULL DO NOTHING',
+                valid[i:i + batch_size],
+            )
+            inserted += conn.total_changes - before
+        if inserted:
+            conn.execute(
+                'INSERT INTO job_status_history (application_id, email, previous_status, status, changed_at) '
+                'SELECT application_id, email, NULL, status, ? FROM jobs '
+                'WHERE application_id > ? AND email = ? ORDER BY application_id',
+                (_now(), last_id, email),
+            )
+    return ImportResult(inserted, len(valid) - inserted, errors)
+
+
+def iter_jobs(email, batch_size=BATCH_SIZE, pool=None):
+    """All of a user's applications in id order, fetched batch by batch."""
+    last_id = 0
+    while True:
+        with _pool(pool).connection() as conn:
+            batch = conn.execute(
+                'SELECT application_id, job_link, company, status FROM jobs '
+                'WHERE email = ? AND application_id > ? ORDER BY application_id LIMIT ?',
+                (email, last_id, batch_size),
+            ).fetchall()
+        if not batch:
+            return
+        yield from batch
+        last_id = batch[-1][0]
+
+
+def export_jobs(email, fmt, batch_size=BATCH_SIZE, pool=None):
+    """
+    Stream a user's applications as CSV or JSON text chunks.
+    """
+    rows = iter_jobs(email, batch_size, pool)
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for count, row in enumerate(rows, start=1):
+            writer.writerow(row)
+            if count % batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    elif fmt == "json":
+        yield "["
+        for count, row in enumerate(rows):
+            yield ("," if count else "") + json.dumps(dict(zip(EXPORT_COLUMNS, row)))
+        yield "]"
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
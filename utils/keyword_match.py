@@ -0,0 +1,221 @@
+"""
+Local, deterministic resume-to-description keyword matching.
+
+Scores a typical resume in about a millisecond without any model call, so the
+ATS page can show a match percentage and missing keywords immediately and
+only spend an LLM call on the narrative summary or on the top-ranked
+candidates of a batch.
+
+A description is reduced to weighted keywords: skills recognised through
+SKILLS (aliases and multi-word phrases map to one canonical name, so "JS"
+and "JavaScript" are the same skill) and its most frequent other content
+terms. Keyword weights grow with how often the description repeats them.
+The match is the weighted share of those keywords found in the resume,
+with skills counting for SKILL_WEIGHT of the score.
+"""
+import math
+import re
+from collections import Counter, namedtuple
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+MAX_PHRASE_WORDS = 3
+MAX_TERMS = 25
+MAX_MISSING = 10
+SKILL_WEIGHT = 0.7
+
+# canonical skill -> aliases, all lower case; multi-word aliases are matched as phrases
+SKILLS = {
+    "python": ["python", "python3"],
+    "java": ["java"],
+    "javascript": ["javascript", "js", "es6", "ecmascript"],
+    "typescript": ["typescript", "ts"],
+    "c": ["c"],
+    "c++": ["c++", "cpp"],
+    "c#": ["c#", "csharp"],
+    "go": ["golang"],
+    "rust": ["rust"],
+    "kotlin": ["kotlin"],
+    "swift": ["swift"],
+    "php": ["php"],
+    "ruby": ["ruby"],
+    "scala": ["scala"],
+    "r": ["r programming", "rstudio"],
+    "matlab": ["matlab"],
+    "sql": ["sql"],
+    "mysql": ["mysql"],
+    "postgresql": ["postgresql", "postgres"],
+    "sqlite": ["sqlite"],
+    "mongodb": ["mongodb", "mongo"],
+    "redis": ["redis"],
+    "elasticsearch": ["elasticsearch", "elastic search"],
+    "html": ["html", "html5"],
+    "css": ["css", "css3"],
+    "sass": ["sass", "scss"],
+    "tailwind": ["tailwind", "tailwindcss"],
+    "react": ["react", "react.js", "reactjs"],
+    "angular": ["angular", "angularjs"],
+    "vue": ["vue", "vue.js", "vuejs"],
+    "next.js": ["next.js", "nextjs"],
+    "node.js": ["node.js", "nodejs", "node"],
+    "express": ["express", "express.js", "expressjs"],
+    "django": ["django"],
+    "flask": ["flask"],
+    "fastapi": ["fastapi"],
+    "spring": ["spring", "spring boot", "springboot"],
+    "graphql": ["graphql"],
+    "rest api": ["restful", "rest api", "rest apis"],
+    "microservices": ["microservices", "microservice"],
+    "git": ["git", "github", "gitlab"],
+    "linux": ["linux", "unix"],
+    "docker": ["docker", "containers", "containerization"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "terraform": ["terraform"],
+    "ansible": ["ansible"],
+    "ci/cd": ["ci/cd", "cicd", "continuous integration", "continuous delivery", "jenkins", "github actions"],
+    "aws": ["aws", "amazon web services", "ec2", "s3", "lambda"],
+    "azure": ["azure", "microsoft azure"],
+    "gcp": ["gcp", "google cloud", "google cloud platform"],
+    "machine learning": ["machine learning", "ml"],
+    "deep learning": ["deep learning", "dl", "neural networks", "neural network"],
+    "nlp": ["nlp", "natural language processing"],
+    "computer vision": ["computer vision", "opencv"],
+    "generative ai": ["generative ai", "genai", "llm", "llms", "large language models"],
+    "tensorflow": ["tensorflow", "keras"],
+    "pytorch": ["pytorch", "torch"],
+    "scikit-learn": ["scikit-learn", "sklearn", "scikit learn"],
+    "pandas": ["pandas"],
+    "numpy": ["numpy"],
+    "data analysis": ["data analysis", "data analytics", "analytics"],
+    "data visualization": ["data visualization", "tableau", "power bi", "powerbi", "matplotlib"],
+    "statistics": ["statistics", "statistical"],
+    "spark": ["spark", "pyspark", "apache spark"],
+    "hadoop": ["hadoop"],
+    "kafka": ["kafka"],
+    "airflow": ["airflow"],
+    "etl": ["etl", "data pipelines", "data pipeline"],
+    "excel": ["excel", "spreadsheets"],
+    "android": ["android"],
+    "ios": ["ios"],
+    "flutter": ["flutter", "dart"],
+    "react native": ["react native"],
+    "unit testing": ["unit testing", "unit tests", "pytest", "junit", "jest", "testing"],
+    "selenium": ["selenium"],
+    "agile": ["agile", "scrum", "kanban"],
+    "jira": ["jira"],
+    "oop": ["oop", "object oriented", "object-oriented"],
+    "data structures": ["data structures", "dsa"],
+    "algorithms": ["algorithms", "algorithm"],
+    "system design": ["system design", "distributed systems"],
+    "security": ["security", "cybersecurity", "owasp"],
+    "networking": ["networking", "tcp/ip", "tcp", "dns"],
+    "figma": ["figma"],
+    "ui/ux": ["ui/ux", "ux", "user experience", "user interface"],
+    "communication": ["communication", "communication skills"],
+    "leadership": ["leadership", "mentoring"],
+}
+
+ENGLISH_STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each etc few for from further had has have having he her
+here hers him his how i if in into is it its itself just me more most my no nor not now of off on once only or
+other our ours out over own per same she should so some such than that the their theirs them then there these
+they this those through to too under until up very via was we were what when where which while who whom why will
+with would you your yours
+""".split())
+
+# Words every job description uses that say nothing about the job
+STOPWORDS = ENGLISH_STOPWORDS | frozenset("""
+ability able across candidate candidates company excellent experience experienced familiarity good great
+ideal including job knowledge looking must plus preferred proficiency proficient required requirements
+responsibilities role skills strong team understanding using work working year years
+""".split())
+
+Keywords = namedtuple("Keywords", ["skills", "terms"])
+# match is a percentage in [0, 100], or None when the description has no keywords
+Prescore = namedtuple("Prescore", ["match", "missing", "matched"])
+
+
+def tokenize(text):
+    return [token.rstrip(".") for token in TOKEN_RE.findall(text.lower())]
+
+
+def _alias_index():
+    index = {}
+    for skill, aliases in SKILLS.items():
+        for alias in aliases:
+            index[tuple(tokenize(alias)) or (alias,)] = skill
+    return index
+
+
+ALIASES = _alias_index()
+
+
+def find_skills(tokens):
+    """
+    :return: Counter of canonical skill -> mentions, longest phrase first so
+        "react native" is not also counted as "react"
+    """
+    found = Counter()
+    i = 0
+    while i < len(tokens):
+        for size in range(min(MAX_PHRASE_WORDS, len(tokens) - i), 0, -1):
+            skill = ALIASES.get(tuple(tokens[i:i + size]))
+            if skill:
+                found[skill] += 1
+                i += size
+                break
+        else:
+            i += 1
+    return found
+
+
+def content_terms(tokens):
+    return Counter(t for t in tokens if len(t) > 2 and t not in STOPWORDS and not t.isdigit())
+
+
+def description_keywords(description):
+    """
+    Weighted keywords of a job description: {skill: weight}, {term: weight}.
+    Weights are 1 + log(mentions), so repetition matters but does not dominate.
+    """
+    tokens = tokenize(description)
+    skills = find_skills(tokens)
+    skill_tokens = {token for alias in ALIASES for token in alias if ALIASES[alias] in skills}
+    terms = content_terms(t for t in tokens if t not in skill_tokens)
+    return Keywords(
+        {skill: 1 + math.log(count) for skill, count in skills.items()},
+        {term: 1 + math.log(count) for term, count in terms.most_common(MAX_TERMS)},
+    )
+
+
+def prescore(resume_text, keywords):
+    """
+    :param keywords: description_keywords() of the job description, computed
+        once per description and shared across a batch
+    :return: Prescore with the match percentage, the missing keywords (most
+        important first) and the matched ones
+    """
+    if not keywords.skills and not keywords.terms:
+        return Prescore(None, [], [])
+    tokens = tokenize(resume_text)
+    have_skills = find_skills(tokens)
+    have_tokens = set(tokens)
+
+    def coverage(weights, present):
+        total = sum(weights.values())
+        return sum(w for k, w in weights.items() if present(k)) / total if total else None
+
+    skill_share = coverage(keywords.skills, lambda skill: skill in have_skills)
+    term_share = coverage(keywords.terms, lambda term: term in have_tokens)
+    if skill_share is None:
+        share = term_share
+    elif term_share is None:
+        share = skill_share
+    else:
+        share = SKILL_WEIGHT * skill_share + (1 - SKILL_WEIGHT) * term_share
+
+    by_weight = lambda item: (-item[1], item[0])
+    missing = [s for s, _ in sorted(keywords.skills.items(), key=by_weight) if s not in have_skills]
+    missing += [t for t, _ in sorted(keywords.terms.items(), key=by_weight) if t not in have_tokens]
+    matched = sorted(s for s in keywords.skills if s in have_skills)
+    return Prescore(round(100 * share, 1), missing[:MAX_MISSING], matched)
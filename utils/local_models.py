@@ -0,0 +1,102 @@
+"""
+Deterministic offline stand-ins for the hosted models.
+
+HashingEmbeddings turns text into a hashed bag-of-words vector and
+TemplateGenerator answers from a template, both with an optional artificial
+latency, so the whole app can be load-tested and benchmarked without
+network access or API quota.
+"""
+import hashlib
+import json
+import math
+import re
+import time
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import GenerationChunk
+
+TOKEN_RE = re.compile(r"\w+")
+EMBEDDING_DIM = 768
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def hashed_vector(text, dim=EMBEDDING_DIM):
+    vector = [0.0] * dim
+    for token in tokenize(text):
+        digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+        vector[digest % dim] += 1.0 if digest & (1 << 63) else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class HashingEmbeddings(Embeddings):
+    def __init__(self, dim=EMBEDDING_DIM, latency=0.0):
+        self.dim = dim
+        self.latency = latency
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return [hashed_vector(t, self.dim) for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+class TemplateGenerator:
+    """
+    Produces a deterministic reply for a prompt. Prompts that ask for the
+    ATS JSON structure get a well-formed JSON answer, everything else gets a
+    short templated summary of the prompt.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def __call__(self, prompt):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16)
+        words = tokenize(prompt)
+        if "PercentageMatch" in prompt:
+            return json.dumps({
+                "PercentageMatch": f"{seed % 101}%",
+                "MissingKeywordsintheResume": sorted(set(words[-200:]))[:5],
+                "ProfileSummary": "Local stand-in evaluation of the resume against the description.",
+            })
+        preview = " ".join(words[-60:])
+        return f"Local stand-in answer ({len(words)} words in prompt).\n\n{preview}"
+
+    def stream(self, prompt, chunk_words=8):
+        """Same reply as __call__, yielded a few words at a time."""
+        words = self(prompt).split(" ")
+        for i in range(0, len(words), chunk_words):
+            piece = " ".join(words[i:i + chunk_words])
+            yield piece if i + chunk_words >= len(words) else piece + " "
+
+
+class LocalLLM(LLM):
+    """LangChain wrapper around TemplateGenerator for use in QA chains."""
+
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self):
+        return "college-ai-local"
+
+    def _call(self, prompt, stop=None, run_manager=None, **kwargs):
+        return TemplateGenerator(self.latency)(prompt)
+
+    def _stream(self, prompt, stop=None, run_manager=None, **kwargs):
+        for piece in TemplateGenerator(self.latency).stream(prompt):
+            if run_manager:
+                run_manager.on_llm_new_token(piece)
+            yield GenerationChunk(text=piece)
@@ -0,0 +1,121 @@
+"""
+Lazy page registry for Home.py.
+
+Every page in menu/ pulls in its own heavy dependencies (langchain, FAISS,
+google.generativeai, openai, gTTS, ...). Instead of importing all of them at
+startup, Home.py asks this registry for a page the first time its tab is
+chosen, so a process only pays for the pages it actually serves.
+
+Run `python -m utils.page_registry` to print an import-time report.
+"""
+import importlib
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+# tab name -> module that exposes a main() function
+PAGES = {
+    'AI Lens': 'menu.AI_Lens',
+    'Ask To PDF': 'menu.Ask_To_PDF',
+    'Resume Analyser': 'menu.Resume_Analyser',
+    'ATS': 'menu.ATS',
+    'Contest Calendar': 'menu.Contest_Calendar',
+    'Job Tracker': 'menu.Job_Tracker',
+    'Projects': 'menu.Projects',
+    'Prompt Examples': 'menu.Prompt_Examples',
+    'AI Interview': 'menu.AI_Interview',
+    'About': 'menu.About',
+    'Account': 'menu.User',
+}
+
+_lock = threading.Lock()
+_loaded = {}
+_import_times = {}
+
+
+def load_page(tab):
+    """
+    Return the main() function of the page behind `tab`, importing its
+    module on first use.
+    :param tab: tab name as shown in the sidebar
+    :return: callable that renders the page
+    """
+    page = _loaded.get(tab)
+    if page is not None:
+        return page
+
+    with _lock:
+        page = _loaded.get(tab)
+        if page is None:
+            module_name = PAGES[tab]
+            start = time.perf_counter()
+            module = importlib.import_module(module_name)
+            elapsed = time.perf_counter() - start
+            _import_times[tab] = elapsed
+            logger.info("Loaded page %s (%s) in %.3fs", tab, module_name, elapsed)
+            page = module.main
+            _loaded[tab] = page
+    return page
+
+
+def import_times():
+    """Seconds spent importing each page loaded so far in this process."""
+    return dict(_import_times)
+
+
+def import_report(pages=None):
+    """
+    Import each page in turn and measure what it costs to load.
+
+    Modules shared between pages are only charged to the first page that
+    imports them, so run this in a fresh interpreter for meaningful numbers.
+    :param pages: tab names to measure, defaults to every registered page
+    :return: list of dicts with page, module, seconds, new_modules and
+        peak_kib (peak heap growth over what was allocated before the import)
+    """
+    report = []
+    tracemalloc.start()
+    try:
+        for tab in pages or PAGES:
+            module_name = PAGES[tab]
+            modules_before = len(sys.modules)
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            start = time.perf_counter()
+            try:
+                importlib.import_module(module_name)
+                error = ""
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            report.append({
+                "page": tab,
+                "module": module_name,
+                "seconds": round(elapsed, 4),
+                "new_modules": len(sys.modules) - modules_before,
+                "peak_kib": round((peak - before) / 1024, 1),
+                "error": error,
+            })
+    finally:
+        tracemalloc.stop()
+    return report
+
+
+def main():
+    report = import_report(sys.argv[1:] or None)
+    print(f"{'Page':<18}{'Seconds':>10}{'Modules':>10}{'Peak KiB':>12}")
+    for row in report:
+        line = f"{row['page']:<18}{row['seconds']:>10.3f}{row['new_modules']:>10}{row['peak_kib']:>12.1f}"
+        if row["error"]:
+            line += f"  ({row['error']})"
+        print(line)
+    print(f"{'Total':<18}{sum(r['seconds'] for r in report):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
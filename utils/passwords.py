@@ -0,0 +1,199 @@
+"""
+Password hashing for the Account page.
+
+bcrypt runs on a small, size-bounded thread pool (bcrypt releases the GIL
+while it hashes) instead of on the Streamlit script thread, so a burst of
+logins queues up instead of pinning every worker. When the queue is full
+new requests are rejected with HashingBusy. Login and sign-up attempts are
+also throttled per email, and failed ones per client IP, so a burst of
+successful logins from one campus NAT address is never locked out.
+
+Hashes are stored as the plain bcrypt string ("$2b$12$..."). Rows written
+by older versions hold str(bytes) ("b'$2b$12$...'"); those are still
+accepted and flagged for re-hashing, as is any hash whose cost differs from
+BCRYPT_ROUNDS.
+"""
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+BCRYPT_ROUNDS = int(os.getenv("COLLEGE_AI_BCRYPT_ROUNDS", "12"))
+HASH_WORKERS = int(os.getenv("COLLEGE_AI_HASH_WORKERS", "0")) or max(1, (os.cpu_count() or 2) // 2)
+MAX_PENDING = HASH_WORKERS * 8
+# How long a request waits for a free queue slot before it is turned away
+QUEUE_WAIT_SECONDS = 2.0
+# Attempts per email, and failed attempts per client IP, allowed in a window
+EMAIL_ATTEMPTS = int(os.getenv("COLLEGE_AI_EMAIL_ATTEMPTS", "5"))
+IP_FAILURES = int(os.getenv("COLLEGE_AI_IP_FAILURES", "30"))
+ATTEMPT_WINDOW_SECONDS = float(os.getenv("COLLEGE_AI_ATTEMPT_WINDOW", "300"))
+
+
+class HashingBusy(Exception):
+    pass
+
+
+class HashingPool:
+    def __init__(self, workers=HASH_WORKERS, max_pending=MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def run(self, fn, *args):
+        """Run `fn(*args)` on the pool and wait for its result."""
+        if not self._slots.acquire(timeout=QUEUE_WAIT_SECONDS):
+            with self._lock:
+                self.rejected += 1
+            raise HashingBusy("Too many password checks in progress")
+        with self._lock:
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self.pending,
+                "queued": max(0, self.pending - self.workers),
+                "peak_pending": self.peak_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+class RateLimiter:
+    """Sliding-window attempt counter per key."""
+
+    def __init__(self, max_attempts, window_seconds):
+        self.max_attempts = max_attempts
+        self.window = window_seconds
+        self._attempts = {}
+        self._lock = threading.Lock()
+
+    def _current(self, key, now):
+        attempts = self._attempts.setdefault(key, deque())
+        while attempts and attempts[0] <= now - self.window:
+            attempts.popleft()
+        return attempts
+
+    def check(self, key):
+        """True if `key` is under the limit; nothing is recorded."""
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if not attempts:
+                return True
+            return len(self._current(key, time.monotonic())) < self.max_attempts
+
+    def record(self, key):
+        now = time.monotonic()
+        with self._lock:
+            self._current(key, now).append(now)
+            if len(self._attempts) > 10000:
+                self._prune(now)
+
+    def allow(self, key):
+        """Record an attempt for `key`; False if it is over the limit."""
+        now = time.monotonic()
+        with self._lock:
+            attempts = self._current(key, now)
+            if len(attempts) >= self.max_attempts:
+                return False
+            attempts.append(now)
+            if len(self._attempts) > 10000:
+                self._prune(now)
+            return True
+
+    def reset(self, key):
+        with self._lock:
+            self._attempts.pop(key, None)
+
+    def _prune(self, now):
+        for key in [k for k, v in self._attempts.items() if not v or v[-1] <= now - self.window]:
+            del self._attempts[key]
+
+
+_pool = HashingPool()
+email_limiter = RateLimiter(max_attempts=EMAIL_ATTEMPTS, window_seconds=ATTEMPT_WINDOW_SECONDS)
+ip_limiter = RateLimiter(max_attempts=IP_FAILURES, window_seconds=ATTEMPT_WINDOW_SECONDS)
+
+
+def allow_attempt(email_key, ip=None):
+    """
+    Throttle login/sign-up attempts. The IP is checked first, without
+    spending anything, so a refused attempt does not use up the email's
+    budget; only record_failure() counts against the IP.
+    """
+    if ip is not None and not ip_limiter.check(ip):
+        return False
+    return email_limiter.allow(email_key)
+
+
+def record_failure(ip=None):
+    """Count a failed login or sign-up against the client IP."""
+    if ip is not None:
+        ip_limiter.record(ip)
+
+
+def reset_attempts(email_key):
+    """Forget failed attempts for an email after a successful login."""
+    email_limiter.reset(email_key)
+
+
+def _decode(stored):
+    """Stored hash as bytes, plus whether it is in the legacy str(bytes) form."""
+    if stored.startswith("b'") and stored.endswith("'"):
+        return stored[2:-1].encode("ascii"), True
+    return stored.encode("ascii"), False
+
+
+def _cost(hashed):
+    try:
+        return int(hashed.split(b"$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def _hash(password):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("ascii")
+
+
+def _verify(password, stored):
+    hashed, legacy = _decode(stored)
+    ok = bcrypt.checkpw(password.encode("utf-8"), hashed)
+    return ok, ok and (legacy or _cost(hashed) != BCRYPT_ROUNDS)
+
+
+def hash_password(password):
+    """
+    :return: bcrypt hash string to store
+    :raises HashingBusy: if the hashing queue is full
+    """
+    return _pool.run(_hash, password)
+
+
+def verify_password(password, stored):
+    """
+    :return: (matches, needs_rehash)
+    :raises HashingBusy: if the hashing queue is full
+    """
+    return _pool.run(_verify, password, stored)
+
+
+def hashing_stats():
+    return _pool.stats()
@@ -0,0 +1,156 @@
+"""
+Shared PDF text extraction for Ask_To_PDF, Resume_Analyser and ATS.
+
+Pages are extracted in batches across a process pool, so a long course PDF
+no longer blocks the Streamlit thread page by page. Results are yielded in
+page order as they become available, each one tagged with its source file,
+page number and how long it took to extract. Batches of small files (e.g.
+a recruiter's stack of resumes) are instead extracted one whole file per
+task and yielded as each file finishes.
+"""
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from PyPDF2 import PdfReader
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = int(os.getenv("COLLEGE_AI_PDF_WORKERS", "0")) or os.cpu_count() or 1
+PAGES_PER_TASK = 16
+
+# number is 1-based so it can be shown to the user as is
+Page = namedtuple("Page", ["source", "number", "text", "seconds"])
+# index is the file's position in the input; error is None or a message
+Extracted = namedtuple("Extracted", ["index", "source", "text", "error"])
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+    return _pool
+
+
+def _read_bytes(pdf):
+    if isinstance(pdf, (str, os.PathLike)):
+        with open(pdf, "rb") as f:
+            return f.read()
+    if hasattr(pdf, "getvalue"):
+        return pdf.getvalue()
+    data = pdf.read()
+    if hasattr(pdf, "seek"):
+        pdf.seek(0)
+    return data
+
+
+def document_hash(pdf):
+    """
+    Hash the raw bytes of one uploaded file (or any object with getvalue()/read()).
+    """
+    return hashlib.sha256(_read_bytes(pdf)).hexdigest()
+
+
+def _extract_range(data, start, stop):
+    """Worker: extract pages [start, stop) of one PDF."""
+    reader = PdfReader(io.BytesIO(data))
+    results = []
+    for index in range(start, stop):
+        began = time.perf_counter()
+        text = reader.pages[index].extract_text() or ""
+        results.append((index + 1, text, time.perf_counter() - began))
+    return results
+
+
+def iter_pages(pdf_docs, parallel=True):
+    """
+    Yield a Page for every page of every PDF, in document and page order.
+    :param pdf_docs: uploaded files, file objects or paths
+    :param parallel: set to False to extract on the calling thread
+    """
+    total_pages = 0
+    total_seconds = 0.0
+    slowest = None
+    began = time.perf_counter()
+
+    for pdf in pdf_docs:
+        source = _source_name(pdf)
+        data = _read_bytes(pdf)
+        page_count = len(PdfReader(io.BytesIO(data)).pages)
+
+        # Small files are not worth the trip to another process
+        if not parallel or page_count <= PAGES_PER_TASK:
+            batches = [_extract_range(data, 0, page_count)]
+        else:
+            pool = _get_pool()
+            futures = [
+                pool.submit(_extract_range, data, start, min(start + PAGES_PER_TASK, page_count))
+                for start in range(0, page_count, PAGES_PER_TASK)
+            ]
+            batches = (future.result() for future in futures)
+
+        for batch in batches:
+            for number, text, seconds in batch:
+                total_pages += 1
+                total_seconds += seconds
+                if slowest is None or seconds > slowest[2]:
+                    slowest = (source, number, seconds)
+                logger.debug("Extracted %s page %d in %.3fs", source, number, seconds)
+                yield Page(source, number, text, seconds)
+
+    if total_pages:
+        logger.info(
+            "Extracted %d pages in %.2fs wall, %.2fs CPU, slowest %s page %d (%.3fs)",
+            total_pages, time.perf_counter() - began, total_seconds, *slowest,
+        )
+
+
+def extract_text(pdf_docs, parallel=True):
+    """All text of all PDFs as one string, pages separated by a newline."""
+    return "\n".join(page.text for page in iter_pages(pdf_docs, parallel) if page.text)
+
+
+def _extract_document(data):
+    """Worker: all text of one PDF."""
+    reader = PdfReader(io.BytesIO(data))
+    return "\n".join(text for text in (page.extract_text() or "" for page in reader.pages) if text)
+
+
+def _source_name(pdf):
+    return os.path.basename(getattr(pdf, "name", None) or str(pdf))
+
+
+def iter_documents(pdf_docs, parallel=True):
+    """
+    Yield an Extracted for every PDF as soon as its text is ready, in
+    completion order. A file that cannot be read is reported through
+    `error` instead of failing the whole batch.
+    """
+    pdf_docs = list(pdf_docs)
+    began = time.perf_counter()
+    if not parallel or len(pdf_docs) == 1:
+        for index, pdf in enumerate(pdf_docs):
+            try:
+                yield Extracted(index, _source_name(pdf), _extract_document(_read_bytes(pdf)), None)
+            except Exception as e:
+                yield Extracted(index, _source_name(pdf), "", f"Could not read PDF: {e}")
+    else:
+        pool = _get_pool()
+        futures = {pool.submit(_extract_document, _read_bytes(pdf)): index for index, pdf in enumerate(pdf_docs)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                yield Extracted(index, _source_name(pdf_docs[index]), future.result(), None)
+            except Exception as e:
+                yield Extracted(index, _source_name(pdf_docs[index]), "", f"Could not read PDF: {e}")
+    logger.info("Extracted %d files in %.2fs", len(pdf_docs), time.perf_counter() - began)
@@ -0,0 +1,241 @@
+"""
+Model provider abstraction used by every AI page.
+
+Pages ask a provider for embeddings, a LangChain chat model for QA chains,
+or plain text generation, instead of talking to Google Gemini or OpenAI
+directly. Text generation and chat are required of every provider; the
+rest are optional capabilities a provider lists in `capabilities`, and a
+page names the ones it needs when it asks for a provider so a mismatch
+fails at once with a clear error.
+
+Set COLLEGE_AI_PROVIDER=local to swap every page onto the deterministic
+offline stand-in in utils/local_models.py, and COLLEGE_AI_LOCAL_LATENCY to
+give it an artificial per-call latency in seconds. No other provider can
+be forced on every page, since model names are provider specific.
+"""
+import abc
+import os
+import threading
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Providers that may be forced on every page through COLLEGE_AI_PROVIDER
+OVERRIDES = {"local"}
+
+
+class UnsupportedCapability(NotImplementedError):
+    pass
+
+
+class Provider(abc.ABC):
+    name = ""
+    needs_api_key = True
+    # Optional methods implemented besides generate, stream and chat:
+    # "embeddings", "chat_model" and "image" (generate_image)
+    capabilities = frozenset()
+
+    def _unsupported(self, capability):
+        raise UnsupportedCapability(f"The {self.name} provider does not support {capability}")
+
+    def embeddings(self, model):
+        """LangChain embeddings object for `model`."""
+        self._unsupported("embeddings")
+
+    def chat_model(self, model, temperature):
+        """LangChain chat model / LLM for QA chains."""
+        self._unsupported("chat_model")
+
+    @abc.abstractmethod
+    def generate(self, prompt, model, temperature=None):
+        """Generate a text reply for a single prompt."""
+
+    def stream(self, prompt, model, temperature=None):
+        """Generate a text reply for a single prompt, yielding it in pieces."""
+        yield self.generate(prompt, model, temperature)
+
+    def generate_image(self, prompt, image_bytes, mime_type, model):
+        """Generate a text reply for a prompt about an image."""
+        self._unsupported("image")
+
+    @abc.abstractmethod
+    def chat(self, messages, model):
+        """Generate a reply for a list of {"role", "content"} messages."""
+
+    def is_transient(self, error):
+        """Whether a failed call is worth retrying (rate limit, timeout, outage)."""
+        return isinstance(error, (ConnectionError, TimeoutError))
+
+
+class GoogleProvider(Provider):
+    name = "google"
+    capabilities = frozenset({"embeddings", "chat_model", "image"})
+
+    def __init__(self):
+        import google.generativeai as genai
+        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+        self._genai = genai
+
+    def embeddings(self, model):
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        return GoogleGenerativeAIEmbeddings(model=model)
+
+    def chat_model(self, model, temperature):
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(model=model, temperature=temperature)
+
+    def _generation_config(self, temperature):
+        if temperature is None:
+            return None
+        return self._genai.types.GenerationConfig(temperature=temperature)
+
+    def generate(self, prompt, model, temperature=None):
+        response = self._genai.GenerativeModel(model).generate_content(
+            prompt, generation_config=self._generation_config(temperature)
+        )
+        return response.text
+
+    def stream(self, prompt, model, temperature=None):
+        response = self._genai.GenerativeModel(model).generate_content(
+            prompt, generation_config=self._generation_config(temperature), stream=True
+        )
+        for chunk in response:
+            yield chunk.text
+
+    def generate_image(self, prompt, image_bytes, mime_type, model):
+        import google.ai.generativelanguage as glm
+        response = self._genai.GenerativeModel(model).generate_content(
+            glm.Content(
+                parts=[
+                    glm.Part(text=prompt),
+                    glm.Part(inline_data=glm.Blob(mime_type=mime_type, data=image_bytes)),
+                ]
+            )
+        )
+        response.resolve()
+        return response.text
+
+    def chat(self, messages, model):
+        prompt = "\n\n".join(f"{m['role']}: {m['content']}" for m in messages)
+        return self.generate(prompt, model)
+
+    def is_transient(self, error):
+        from google.api_core import exceptions
+        transient = (
+            exceptions.TooManyRequests,
+            exceptions.ResourceExhausted,
+            exceptions.ServiceUnavailable,
+            exceptions.DeadlineExceeded,
+            exceptions.InternalServerError,
+        )
+        return isinstance(error, transient) or super().is_transient(error)
+
+
+class OpenAIProvider(Provider):
+    name = "openai"
+
+    def __init__(self):
+        import openai
+        self._openai = openai
+
+    def chat(self, messages, model):
+        response = self._openai.ChatCompletion.create(model=model, messages=messages)
+        return response.choices[0].message["content"]
+
+    def generate(self, prompt, model, temperature=None):
+        kwargs = {} if temperature is None else {"temperature": temperature}
+        response = self._openai.ChatCompletion.create(
+            model=model, messages=[{"role": "user", "content": prompt}], **kwargs
+        )
+        return response.choices[0].message["content"]
+
+    def stream(self, prompt, model, temperature=None):
+        kwargs = {} if temperature is None else {"temperature": temperature}
+        response = self._openai.ChatCompletion.create(
+            model=model, messages=[{"role": "user", "content": prompt}], stream=True, **kwargs
+        )
+        for chunk in response:
+            yield chunk.choices[0].delta.get("content", "")
+
+    def is_transient(self, error):
+        errors = self._openai.error
+        transient = (
+            errors.RateLimitError,
+            errors.APIConnectionError,
+            errors.Timeout,
+            errors.ServiceUnavailableError,
+            errors.TryAgain,
+        )
+        return isinstance(error, transient) or super().is_transient(error)
+
+
+class LocalProvider(Provider):
+    name = "local"
+    needs_api_key = False
+    capabilities = frozenset({"embeddings", "chat_model", "image"})
+
+    def __init__(self, latency=None):
+        from utils.local_models import TemplateGenerator
+        if latency is None:
+            latency = float(os.getenv("COLLEGE_AI_LOCAL_LATENCY", "0"))
+        self.latency = latency
+        self.generator = TemplateGenerator(latency)
+
+    def embeddings(self, model):
+        from utils.local_models import HashingEmbeddings
+        return HashingEmbeddings(latency=self.latency)
+
+    def chat_model(self, model, temperature):
+        from utils.local_models import LocalLLM
+        return LocalLLM(latency=self.latency)
+
+    def generate(self, prompt, model, temperature=None):
+        return self.generator(prompt)
+
+    def stream(self, prompt, model, temperature=None):
+        return self.generator.stream(prompt)
+
+    def generate_image(self, prompt, image_bytes, mime_type, model):
+        return self.generator(f"{prompt}\n[image: {mime_type}, {len(image_bytes)} bytes]")
+
+    def chat(self, messages, model):
+        return self.generator("\n\n".join(m["content"] for m in messages))
+
+
+PROVIDERS = {
+    "google": GoogleProvider,
+    "openai": OpenAIProvider,
+    "local": LocalProvider,
+}
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+
+def get_provider(default="google", needs=()):
+    """
+    Return the provider a page should use. COLLEGE_AI_PROVIDER=local, when
+    set, overrides the page's default for every page.
+    :param needs: optional capabilities the page calls, e.g. ("embeddings", "chat_model")
+    :raise ValueError: if COLLEGE_AI_PROVIDER names anything but an allowed override
+    :raise UnsupportedCapability: if the provider lacks one of `needs`
+    """
+    override = os.getenv("COLLEGE_AI_PROVIDER")
+    if override and override not in OVERRIDES:
+        raise ValueError(
+            f"COLLEGE_AI_PROVIDER={override!r} is not supported; only {', '.join(sorted(OVERRIDES))} "
+            f"can replace every page's provider"
+        )
+    name = override or default
+    missing = set(needs) - PROVIDERS[name].capabilities
+    if missing:
+        raise UnsupportedCapability(f"The {name} provider does not support {', '.join(sorted(missing))}")
+    provider = _providers.get(name)
+    if provider is None:
+        with _providers_lock:
+            provider = _providers.get(name)
+            if provider is None:
+                provider = PROVIDERS[name]()
+                _providers[name] = provider
+    return provider
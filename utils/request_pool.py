@@ -0,0 +1,96 @@
+"""
+Bounded pool for concurrent model requests.
+
+At most `workers` requests are in flight at once, whatever the batch size,
+so a recruiter ranking hundreds of resumes does not burst past the
+provider's rate limit. A request that fails with a transient error (the
+provider decides which ones are) is retried with exponential backoff and
+full jitter; any other error, or running out of attempts, is returned to
+the caller on the request's future.
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = int(os.getenv("COLLEGE_AI_REQUEST_WORKERS", "4"))
+DEFAULT_ATTEMPTS = 4
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+
+
+def backoff_delay(attempt, base=BASE_DELAY, cap=MAX_DELAY, rng=random):
+    """Sleep before retry number `attempt` (1-based): uniform in [0, base * 2^(attempt-1)], capped."""
+    return rng.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class RequestPool:
+    def __init__(self, workers=DEFAULT_WORKERS, attempts=DEFAULT_ATTEMPTS, is_transient=None,
+                 base_delay=BASE_DELAY, max_delay=MAX_DELAY, sleep=time.sleep):
+        """
+        :param is_transient: predicate on an exception, e.g. Provider.is_transient;
+            by default nothing is retried
+        :param sleep: injectable for tests and benchmarks
+        """
+        self.workers = workers
+        self.attempts = attempts
+        self.is_transient = is_transient or (lambda error: False)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="requests")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.retries = 0
+        self.failed = 0
+
+    def _run(self, fn, args):
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            for attempt in range(1, self.attempts + 1):
+                try:
+                    result = fn(*args)
+                except Exception as e:
+                    if attempt == self.attempts or not self.is_transient(e):
+                        with self._lock:
+                            self.failed += 1
+                        raise
+                    with self._lock:
+                        self.retries += 1
+                    self._sleep(backoff_delay(attempt, self.base_delay, self.max_delay))
+                else:
+                    with self._lock:
+                        self.completed += 1
+                    return result
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def submit(self, fn, *args):
+        """Run `fn(*args)` on the pool, retrying transient failures; returns a Future."""
+        return self._executor.submit(self._run, fn, args)
+
+    def shutdown(self, cancel_pending=True):
+        self._executor.shutdown(wait=False, cancel_futures=cancel_pending)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "completed": self.completed,
+                "retries": self.retries,
+                "failed": self.failed,
+            }
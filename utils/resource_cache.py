@@ -0,0 +1,69 @@
+"""
+Process-wide cache for expensive, reusable objects: loaded FAISS indexes,
+embedding clients and QA chains.
+
+Entries are built once by a factory and shared by every session in the
+process. An entry can carry a version (e.g. the mtime of the index file it
+was loaded from); asking for a different version rebuilds it, so a
+re-trained index is picked up on the next question.
+"""
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 64
+
+
+class ResourceCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, factory, version=None):
+        """
+        Return the cached object for `key`, building it with `factory()` if it
+        is missing or was built for another `version`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        # Only one session builds a given entry, the others wait and reuse it
+        with build_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == version:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+            value = factory()
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = (version, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    old_key, _ = self._entries.popitem(last=False)
+                    self._build_locks.pop(old_key, None)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_resources = ResourceCache()
+
+
+def get_resources():
+    return _resources
@@ -0,0 +1,177 @@
+"""
+Persistent cache for model replies, shared by every AI page.
+
+Replies are stored in a small SQLite file keyed by a hash of (provider and
+model, temperature, normalized prompt, hash of the retrieved context or
+attached image), so an exact repeat (the same question about the same PDF
+chunks, the same resume against the same description, the same chatbot
+prompt) is answered without any model call. Prompts are normalized by
+collapsing whitespace and case. Entries expire after `ttl` seconds and the
+file is size-bounded: once it grows past `max_bytes` the least recently
+used replies are evicted. Set COLLEGE_AI_RESPONSE_TTL=0 to turn it off.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from utils.cache_dir import CACHE_DIR
+from utils.streaming import chunk_text
+
+DEFAULT_TTL = float(os.getenv("COLLEGE_AI_RESPONSE_TTL", str(7 * 24 * 3600)))
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def normalize_prompt(prompt):
+    return " ".join(prompt.split()).casefold()
+
+
+def context_hash(context):
+    """sha256 of retrieved text or raw bytes (e.g. an image); "" for no context."""
+    if not context:
+        return ""
+    data = context if isinstance(context, bytes) else context.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def model_id(provider, model):
+    return f"{provider.name}:{model}"
+
+
+def response_key(model, temperature, prompt, context=""):
+    """
+    :param model: provider-qualified model name, e.g. "google:gemini-pro"
+    :param context: text or bytes the reply depends on besides the prompt
+    """
+    parts = [model, repr(temperature), normalize_prompt(prompt), context_hash(context)]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path=None, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path or os.path.join(CACHE_DIR, "responses.db")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)')
+        self._conn.commit()
+        # label -> {"hits", "misses"}
+        self._counters = {}
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    def _count(self, label, field):
+        counters = self._counters.setdefault(label, {"hits": 0, "misses": 0})
+        counters[field] += 1
+
+    def get(self, key, label=""):
+        """:return: the cached reply, or None if missing or expired"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT response, created_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self._count(label, "misses")
+                return None
+            self._conn.execute('UPDATE responses SET last_used = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self._count(label, "hits")
+        return row[0]
+
+    def put(self, key, model, response):
+        if not self.enabled or not response:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, model, response, created_at, last_used) VALUES (?, ?, ?, ?, ?)',
+                (key, model, response, now, now),
+            )
+            self._conn.commit()
+            self._evict(now)
+
+    def _evict(self, now):
+        self._conn.execute('DELETE FROM responses WHERE created_at < ?', (now - self.ttl,))
+        total = self._conn.execute('SELECT COALESCE(SUM(LENGTH(response)), 0) FROM responses').fetchone()[0]
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            victims = []
+            for key, size in self._conn.execute('SELECT key, LENGTH(response) FROM responses ORDER BY last_used'):
+                victims.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            self._conn.executemany('DELETE FROM responses WHERE key = ?', victims)
+        self._conn.commit()
+
+    def generate(self, key, model, produce, label="", accept=None):
+        """
+        Cached reply for `key`, or `produce()` stored under it.
+        :param accept: predicate on a fresh reply; rejected replies (e.g.
+            unparseable JSON) are returned but not cached
+        """
+        cached = self.get(key, label)
+        if cached is not None:
+            return cached
+        response = produce()
+        if accept is None or accept(response):
+            self.put(key, model, response)
+        return response
+
+    def stream(self, key, model, produce, label=""):
+        """
+        Like generate() for streamed replies: a hit is yielded in one piece,
+        a miss streams `produce()` through and is cached once it completes.
+        """
+        cached = self.get(key, label)
+        if cached is not None:
+            yield cached
+            return
+        parts = []
+        for chunk in produce():
+            text = chunk_text(chunk)
+            parts.append(text)
+            yield text
+        self.put(key, model, "".join(parts))
+
+    def stats(self):
+        """Hits, misses and hit rate per label."""
+        with self._lock:
+            return {
+                label: {**c, "hit_rate": c["hits"] / (c["hits"] + c["misses"]) if c["hits"] + c["misses"] else 0.0}
+                for label, c in self._counters.items()
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Process-wide cache shared by every page."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
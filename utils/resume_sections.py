@@ -0,0 +1,116 @@
+"""
+Local resume parser that splits extracted text into its sections.
+
+Resumes are laid out under headings, so a line-based scan is enough. A
+short line is a heading when it is one of the conventional HEADINGS (in any
+case), or when it is made only of section KEYWORDS and QUALIFIERS ("Skills
+& Interests", "Work Experience & Internships"); it starts the section of
+its first keyword, and everything up to the next heading belongs to it.
+Job titles and employers ("Project Manager", "SOFTWARE ENGINEER") are
+content. Text before the first heading (name, contact details, objective)
+is kept as "profile". An all-caps or colon-ended line standing alone
+between blank lines is an unrecognised heading: it closes the previous
+section and is kept under "other", so its text does not leak into e.g. the
+skills section.
+"""
+import re
+from collections import OrderedDict
+
+from utils.keyword_match import find_skills, tokenize
+
+SECTIONS = ["skills", "experience", "education", "projects"]
+
+# section -> headings that start it; matched after lower-casing and stripping punctuation
+HEADINGS = {
+    "profile": ["summary", "profile", "objective", "career objective", "professional summary", "about me", "about"],
+    "skills": [
+        "skills", "technical skills", "programming languages", "key skills", "core skills", "skill set", "skillset", "core competencies",
+        "competencies", "technologies", "tech stack", "tools and technologies", "technical proficiency",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "work history", "internships", "internship", "internship experience", "relevant experience",
+    ],
+    "education": [
+        "education", "academic background", "academics", "educational qualifications", "qualifications",
+        "academic qualifications", "education and training",
+    ],
+    "projects": [
+        "projects", "project", "academic projects", "personal projects", "key projects", "project experience",
+        "selected projects",
+    ],
+    "other": [
+        "certifications", "certificates", "achievements", "awards", "honors", "publications", "activities",
+        "extracurricular activities", "positions of responsibility", "leadership", "volunteering", "languages",
+        "interests", "hobbies", "references", "declaration",
+    ],
+}
+# section -> words that make a heading not in HEADINGS start it; the first
+# keyword in the heading wins, so "Skills & Interests" is skills
+KEYWORDS = {
+    "profile": ["summary", "profile", "objective"],
+    "skills": ["skills", "skill", "skillset", "competencies", "technologies", "tools", "proficiency"],
+    "experience": ["experience", "experiences", "employment", "internships", "internship"],
+    "education": ["education", "academics", "qualifications", "coursework"],
+    "projects": ["projects", "project"],
+    "other": [
+        "certifications", "certificates", "achievements", "awards", "honors", "publications", "activities",
+        "extracurricular", "responsibility", "responsibilities", "leadership", "volunteering", "volunteer",
+        "languages", "interests", "hobbies", "references", "declaration",
+    ],
+}
+# Words a keyword heading may contain besides keywords. Any other word
+# ("Project Manager", "Senior Tools Engineer") makes the line content.
+QUALIFIERS = {
+    "and", "of", "in", "for", "the", "to", "my", "other", "additional", "technical", "work", "professional",
+    "relevant", "key", "core", "personal", "selected", "academic", "research", "industry", "soft", "history",
+}
+MAX_HEADING_WORDS = 5
+
+_PUNCTUATION_RE = re.compile(r"[^a-z ]+")
+# Headings are words with at most &, /, - or an apostrophe between them
+_HEADING_RE = re.compile(r"[A-Za-z][A-Za-z &/'-]*:?")
+_HEADING_INDEX = {heading: section for section, headings in HEADINGS.items() for heading in headings}
+_KEYWORD_INDEX = {keyword: section for section, keywords in KEYWORDS.items() for keyword in keywords}
+
+
+def heading_section(line, isolated=False):
+    """
+    :param isolated: whether the line has a blank line before and after it
+    :return: the section a heading line starts, or None for a content line
+    """
+    line = line.strip()
+    words = _PUNCTUATION_RE.sub(" ", line.lower().replace("&", " and ")).split()
+    if not words or len(words) > MAX_HEADING_WORDS or not _HEADING_RE.fullmatch(line):
+        return None
+    known = _HEADING_INDEX.get(" ".join(words))
+    if known:
+        return known
+    if all(word in _KEYWORD_INDEX or word in QUALIFIERS for word in words):
+        keyword = next((_KEYWORD_INDEX[word] for word in words if word in _KEYWORD_INDEX), None)
+        if keyword:
+            return keyword
+    # Names, job titles and employers are often in capitals too, so an
+    # unknown heading must stand on its own between blank lines
+    if isolated and (line.isupper() or line.endswith(":")) and not find_skills(tokenize(line)):
+        return "other"
+    return None
+
+
+def split_sections(text):
+    """
+    :return: OrderedDict of section -> text, in the order sections first
+        appear; a section that appears twice is concatenated
+    """
+    sections = OrderedDict()
+    current = "profile"
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        isolated = 0 < i < len(lines) - 1 and not lines[i - 1].strip() and not lines[i + 1].strip()
+        section = heading_section(line, isolated)
+        if section:
+            current = section
+            continue
+        if line.strip():
+            sections.setdefault(current, []).append(line.strip())
+    return OrderedDict((name, "\n".join(lines)) for name, lines in sections.items())
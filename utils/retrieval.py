@@ -0,0 +1,158 @@
+"""
+Hybrid retrieval for Ask_To_PDF: BM25 and FAISS, fused, reranked and
+trimmed to a token budget.
+
+Dense search alone misses chunks that share rare exact terms with the
+question (names, codes, acronyms), and stuffing its default top 4 into the
+prompt pays for every weak match. HybridRetriever keeps an in-process BM25
+inverted index over the same chunks as the FAISS index and:
+
+1. takes the top `fetch_k` of each and fuses them with reciprocal rank fusion,
+2. reranks the fused candidates locally on a blend of dense cosine
+   similarity, normalized BM25 score and query-term coverage,
+3. keeps the best ones, skipping near-duplicates (overlapping chunks) and
+   anything scoring far below the best, until `max_chunks` or the token
+   budget is reached.
+
+No extra model or embedding call is made; the question vector is the one
+the caller already computed.
+"""
+import heapq
+import math
+import os
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from utils.keyword_match import ENGLISH_STOPWORDS
+
+TOKEN_RE = re.compile(r"\w+")
+K1 = 1.5
+B = 0.75
+RRF_K = 60
+FETCH_K = 20
+MAX_CHUNKS = 4
+TOKEN_BUDGET = int(os.getenv("COLLEGE_AI_CONTEXT_TOKENS", "1200"))
+# Candidates scoring below this share of the best one are dropped
+MIN_RELATIVE_SCORE = 0.6
+DUPLICATE_OVERLAP = 0.8
+CHARS_PER_TOKEN = 4
+W_DENSE, W_LEXICAL, W_COVERAGE = 0.5, 0.3, 0.2
+
+
+def terms(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in ENGLISH_STOPWORDS]
+
+
+def estimate_tokens(text):
+    """Rough prompt cost of `text`; about 4 characters per token for English."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class BM25Index:
+    def __init__(self, texts, k1=K1, b=B):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(list)
+        self.lengths = []
+        self.term_sets = []
+        for doc, text in enumerate(texts):
+            counts = Counter(terms(text))
+            self.lengths.append(sum(counts.values()))
+            self.term_sets.append(frozenset(counts))
+            for term, tf in counts.items():
+                self.postings[term].append((doc, tf))
+        count = len(self.lengths)
+        self.avg_length = (sum(self.lengths) / count if count else 0) or 1
+        self.idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def search(self, query, k):
+        """:return: up to k (doc position, score), best first"""
+        scores = defaultdict(float)
+        for term in set(terms(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc, tf in self.postings[term]:
+                norm = 1 - self.b + self.b * self.lengths[doc] / self.avg_length
+                scores[doc] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+class HybridRetriever:
+    def __init__(self, vector_store):
+        """:param vector_store: a LangChain FAISS store; its chunks are indexed for BM25 once"""
+        self.vector_store = vector_store
+        self.index = vector_store.index
+        self.documents = [
+            vector_store.docstore.search(vector_store.index_to_docstore_id[i]) for i in range(self.index.ntotal)
+        ]
+        self.bm25 = BM25Index(doc.page_content for doc in self.documents)
+
+    def _dense(self, vector, k):
+        distances, positions = self.index.search(np.asarray([vector], dtype="float32"), k)
+        return [int(p) for p in positions[0] if p >= 0]
+
+    def _cosine(self, vector, positions):
+        query = np.asarray(vector, dtype="float32")
+        chunks = np.vstack([self.index.reconstruct(p) for p in positions])
+        norms = np.linalg.norm(chunks, axis=1) * (np.linalg.norm(query) or 1.0)
+        return chunks @ query / np.where(norms == 0, 1.0, norms)
+
+    def candidates(self, query, vector, fetch_k=FETCH_K):
+        """Reciprocal rank fusion of the dense and BM25 top `fetch_k`, with BM25 scores."""
+        lexical = self.bm25.search(query, fetch_k)
+        fused = defaultdict(float)
+        for rank, position in enumerate(self._dense(vector, fetch_k)):
+            fused[position] += 1 / (RRF_K + rank)
+        for rank, (position, _) in enumerate(lexical):
+            fused[position] += 1 / (RRF_K + rank)
+        top = heapq.nlargest(fetch_k, fused, key=fused.get)
+        return top, dict(lexical)
+
+    def rerank(self, query, vector, positions, bm25_scores):
+        """:return: (position, score) best first"""
+        if not positions:
+            return []
+        query_terms = set(terms(query))
+        best_bm25 = max(bm25_scores.values(), default=0) or 1.0
+        dense = self._cosine(vector, positions)
+        scored = []
+        for position, cosine in zip(positions, dense):
+            coverage = len(query_terms & self.bm25.term_sets[position]) / len(query_terms) if query_terms else 0.0
+            score = (
+                W_DENSE * max(0.0, float(cosine))
+                + W_LEXICAL * bm25_scores.get(position, 0.0) / best_bm25
+                + W_COVERAGE * coverage
+            )
+            scored.append((position, score))
+        return sorted(scored, key=lambda item: -item[1])
+
+    def search(self, query, vector, max_chunks=MAX_CHUNKS, token_budget=TOKEN_BUDGET, fetch_k=FETCH_K):
+        """
+        :param vector: the query's embedding
+        :return: the chunks to put in the prompt, best first
+        """
+        if not self.documents:
+            return []
+        positions, bm25_scores = self.candidates(query, vector, fetch_k)
+        ranked = self.rerank(query, vector, positions, bm25_scores)
+        chosen = []
+        used = 0
+        for position, score in ranked:
+            if len(chosen) == max_chunks or score < MIN_RELATIVE_SCORE * ranked[0][1]:
+                break
+            chunk_terms = self.bm25.term_sets[position]
+            if any(len(chunk_terms & self.bm25.term_sets[p]) / (len(chunk_terms | self.bm25.term_sets[p]) or 1)
+                   > DUPLICATE_OVERLAP for p in chosen):
+                continue
+            tokens = estimate_tokens(self.documents[position].page_content)
+            if chosen and used + tokens > token_budget:
+                continue
+            chosen.append(position)
+            used += tokens
+        return [self.documents[p] for p in chosen]
@@ -0,0 +1,125 @@
+"""
+Per-document semantic cache of answered questions for Ask_To_PDF.
+
+Every answered question is kept with its embedding in a small in-memory
+FAISS inner-product index for the document set it was asked about. A new
+question is embedded once and looked up there; when an earlier question is
+at least `threshold` cosine-similar, its answer is returned without
+retrieval or a model call. The question vector is then reused for the
+similarity search on a miss, so the cache costs no extra embedding call.
+
+Entries are scoped to (owner, document fingerprint), bounded per document
+set and across document sets (least recently used first), and live for the
+lifetime of the process.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import faiss
+import numpy as np
+
+DEFAULT_THRESHOLD = float(os.getenv("COLLEGE_AI_SEMANTIC_THRESHOLD", "0.92"))
+MAX_QUESTIONS_PER_DOCUMENT = 256
+MAX_DOCUMENTS = 128
+
+# seconds is how long answering took originally, i.e. what a hit saves
+Answer = namedtuple("Answer", ["question", "answer", "sources", "seconds"])
+Hit = namedtuple("Hit", ["entry", "similarity"])
+
+
+def _normalized(vector):
+    matrix = np.asarray([vector], dtype="float32")
+    faiss.normalize_L2(matrix)
+    return matrix
+
+
+class _DocumentCache:
+    def __init__(self, dim):
+        self.index = faiss.IndexFlatIP(dim)
+        self.entries = []
+
+
+class SemanticCache:
+    def __init__(self, threshold=DEFAULT_THRESHOLD, max_questions=MAX_QUESTIONS_PER_DOCUMENT,
+                 max_documents=MAX_DOCUMENTS):
+        self.threshold = threshold
+        self.max_questions = max_questions
+        self.max_documents = max_documents
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.seconds_saved = 0.0
+
+    def lookup(self, document_key, vector, threshold=None):
+        """
+        :return: Hit for the most similar earlier question at or above the
+            threshold, or None
+        """
+        threshold = self.threshold if threshold is None else threshold
+        began = time.perf_counter()
+        query = _normalized(vector)
+        with self._lock:
+            self.lookups += 1
+            cache = self._documents.get(document_key)
+            if cache is None or not cache.entries or cache.index.d != query.shape[1]:
+                return None
+            self._documents.move_to_end(document_key)
+            scores, ids = cache.index.search(query, 1)
+            similarity, position = float(scores[0][0]), int(ids[0][0])
+            if position < 0 or similarity < threshold:
+                return None
+            entry = cache.entries[position]
+            self.hits += 1
+            self.seconds_saved += max(0.0, entry.seconds - (time.perf_counter() - began))
+        return Hit(entry, similarity)
+
+    def add(self, document_key, vector, question, answer, sources=(), seconds=0.0):
+        if not answer:
+            return
+        matrix = _normalized(vector)
+        with self._lock:
+            cache = self._documents.get(document_key)
+            if cache is None or cache.index.d != matrix.shape[1]:
+                cache = self._documents[document_key] = _DocumentCache(matrix.shape[1])
+            self._documents.move_to_end(document_key)
+            if len(cache.entries) >= self.max_questions:
+                # Flat indexes cannot drop one vector cheaply; rebuild without the oldest
+                keep = cache.index.reconstruct_n(1, cache.index.ntotal - 1)
+                cache.index.reset()
+                cache.index.add(keep)
+                cache.entries.pop(0)
+            cache.index.add(matrix)
+            cache.entries.append(Answer(question, answer, list(sources), seconds))
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+
+    def forget(self, document_key):
+        with self._lock:
+            self._documents.pop(document_key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+                "seconds_saved": round(self.seconds_saved, 3),
+                "documents": len(self._documents),
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_semantic_cache():
+    """Process-wide cache shared by every session."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SemanticCache()
+    return _cache
@@ -0,0 +1,82 @@
+"""
+Helpers for rendering model output token by token.
+
+TimedStream wraps any stream of text chunks (plain strings, LangChain
+message chunks or Gemini response chunks), normalises them to text and
+measures time to first token, which is logged and aggregated per page.
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def chunk_text(chunk):
+    if isinstance(chunk, str):
+        return chunk
+    content = getattr(chunk, "content", None)
+    if content is None:
+        content = getattr(chunk, "text", "")
+    return content if isinstance(content, str) else str(content)
+
+
+class TimedStream:
+    """
+    Iterable over the text of `chunks`. Timing starts when the object is
+    created, so create it right before the request is sent.
+    """
+
+    def __init__(self, chunks, label):
+        self.chunks = chunks
+        self.label = label
+        self.started = time.perf_counter()
+        self.ttft = None
+        self.seconds = None
+        self.text = ""
+
+    def __iter__(self):
+        parts = []
+        for chunk in self.chunks:
+            text = chunk_text(chunk)
+            if not text:
+                continue
+            if self.ttft is None:
+                self.ttft = time.perf_counter() - self.started
+            parts.append(text)
+            yield text
+        self.seconds = time.perf_counter() - self.started
+        self.text = "".join(parts)
+        if self.ttft is None:
+            self.ttft = self.seconds
+        _record(self.label, self.ttft, self.seconds)
+        logger.info(
+            "%s: first token after %.3fs, %d chars in %.3fs",
+            self.label, self.ttft, len(self.text), self.seconds,
+        )
+
+
+def _record(label, ttft, seconds):
+    with _stats_lock:
+        stats = _stats.setdefault(label, {"streams": 0, "ttft_total": 0.0, "seconds_total": 0.0, "ttft_max": 0.0})
+        stats["streams"] += 1
+        stats["ttft_total"] += ttft
+        stats["seconds_total"] += seconds
+        stats["ttft_max"] = max(stats["ttft_max"], ttft)
+
+
+def stream_stats():
+    """Average and worst time to first token per label, in seconds."""
+    with _stats_lock:
+        return {
+            label: {
+                "streams": s["streams"],
+                "ttft_avg": s["ttft_total"] / s["streams"],
+                "ttft_max": s["ttft_max"],
+                "seconds_avg": s["seconds_total"] / s["streams"],
+            }
+            for label, s in _stats.items()
+        }
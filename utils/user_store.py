@@ -0,0 +1,66 @@
+"""
+Account queries for users.db.
+
+Every lookup goes through the indexed, normalized `email_key` column, so
+checking whether an account exists or fetching it for login is a single
+index probe instead of a scan of the whole users table. Login first probes
+the exact email (also unique and indexed), which is a hit whenever the
+email is typed as it was registered, and finds legacy accounts whose email
+only differs by case from an older one; other spellings fall back to the
+normalized key.
+"""
+import sqlite3
+
+from utils.db import USERS_DB, get_pool
+
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+def _pool(pool):
+    return pool or get_pool(USERS_DB)
+
+
+def get_user(email, pool=None):
+    """
+    :return: (email, stored password) or None if there is no such account
+    """
+    exact = (email or "").strip()
+    with _pool(pool).connection() as conn:
+        row = conn.execute('SELECT email, password FROM users WHERE email = ?', (exact,)).fetchone()
+        if row is not None:
+            return row
+        return conn.execute(
+            'SELECT email, password FROM users WHERE email_key = ?', (normalize_email(email),)
+        ).fetchone()
+
+
+def email_exists(email, pool=None):
+    with _pool(pool).connection() as conn:
+        row = conn.execute(
+            'SELECT 1 FROM users WHERE email_key = ? LIMIT 1', (normalize_email(email),)
+        ).fetchone()
+    return row is not None
+
+
+def create_user(email, password, pool=None):
+    """
+    Insert a new account.
+    :return: False if the email is already registered
+    """
+    try:
+        with _pool(pool).transaction() as conn:
+            conn.execute(
+                'INSERT INTO users (email, email_key, password) VALUES (?, ?, ?)',
+                (email.strip(), normalize_email(email), password),
+            )
+    except sqlite3.IntegrityError:
+        return False
+    return True
+
+
+def update_password(email, password, pool=None):
+    """:param email: the account's stored email, as returned by get_user()"""
+    with _pool(pool).transaction() as conn:
+        conn.execute('UPDATE users SET password = ? WHERE email = ?', (password, email))